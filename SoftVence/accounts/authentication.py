@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from vendors.models import Vendor
+from .models import User
+
+REVOKED_KEY = "auth:revoked:{}"
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user's role and vendor id. Both claims are
+    copied into the access token.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token["role"] = user.role
+        token["vendor_id"] = Vendor.objects.filter(user=user).values_list("id", flat=True).first()
+        return token
+
+
+def revoke_user_tokens(*user_ids):
+    """
+    Reject every token issued to the users before now. Kept only as long as
+    an access token can live.
+    """
+    lifetime = settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"]
+    revoked_at = int(timezone.now().timestamp())
+    cache.set_many(
+        {REVOKED_KEY.format(user_id): revoked_at for user_id in user_ids}, timeout=int(lifetime.total_seconds())
+    )
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds request.user from the token claims on
+    read requests instead of loading the accounts.User row.
+
+    The user is an unsaved-looking User instance with only id and role set
+    (plus `vendor_id`), so ORM filters and equality checks keep working.
+    Deactivation and role changes, including queryset update()s, take
+    effect through a Redis revocation timestamp; the user logs in again
+    for a token with the new role. There is no refresh endpoint: one
+    would have to re-read the role rather than copy the refresh token's
+    claims. Writes and tokens issued before the claims existed still
+    load the row.
+    """
+
+    def authenticate(self, request):
+        if request.method not in SAFE_METHODS:
+            return super().authenticate(request)
+
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if "role" not in validated_token:
+            return self.get_user(validated_token), validated_token
+        return self.get_claims_user(validated_token), validated_token
+
+    def get_claims_user(self, validated_token):
+        user_id = User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+        revoked_at = cache.get(REVOKED_KEY.format(user_id))
+        if revoked_at is not None and validated_token.get("iat", 0) <= revoked_at:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        user = User(id=user_id, role=validated_token["role"], is_active=True)
+        user._state.adding = False
+        user._state.db = "default"
+        user.vendor_id = validated_token.get("vendor_id")
+        return user
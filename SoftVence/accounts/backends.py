@@ -0,0 +1,26 @@
+from django.contrib.auth.backends import ModelBackend
+from .hashing import verify_password
+from .models import User
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend whose password check runs in the hashing pool and which
+    rehashes the stored password on login when the hasher cost changed.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = User._default_manager.filter(**{User.USERNAME_FIELD: username}).first()
+        ok, new_encoded = verify_password(password, user.password if user else None)
+        if not ok or not self.user_can_authenticate(user):
+            return None
+
+        if new_encoded:
+            User._default_manager.filter(pk=user.pk).update(password=new_encoded)
+            user.password = new_encoded
+        return user
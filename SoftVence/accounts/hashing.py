@@ -0,0 +1,140 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password, get_hasher, identify_hasher, make_password
+from common.validation_err import APIException
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 with the iteration count taken from PASSWORD_HASH_ITERATIONS.
+    Stored hashes with a different count are flagged for rehashing.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+
+class HashingBusy(APIException):
+    status_code = 503
+
+    def __init__(self, wait=1):
+        self.wait = wait  # sent as Retry-After by DRF's exception handler
+        super().__init__(status_code=self.status_code, message="Server is busy, please retry shortly.")
+
+
+def _init_worker():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "merketLink.settings")
+    import django
+    django.setup()
+
+
+def _hash(password):
+    return make_password(password)
+
+
+def _verify(password, encoded):
+    if encoded is None:
+        # unknown user: spend the same time as a real check
+        make_password(password)
+        return False, None
+
+    if not check_password(password, encoded):
+        return False, None
+
+    preferred = get_hasher("default")
+    hasher = identify_hasher(encoded)
+    if hasher.algorithm != preferred.algorithm or preferred.must_update(encoded):
+        return True, make_password(password)
+    return True, None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = None
+
+
+def _get_pool():
+    global _pool, _slots
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if _slots is None:
+                    _slots = threading.BoundedSemaphore(settings.PASSWORD_HASHING_QUEUE)
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASHING_WORKERS,
+                    initializer=_init_worker,
+                )
+    return _pool
+
+
+def _discard_pool(pool):
+    # a worker died (e.g. OOM-killed); the next call builds a fresh pool
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(fn, *args):
+    pool = _get_pool()
+    try:
+        return pool, pool.submit(fn, *args)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        pool = _get_pool()
+        return pool, pool.submit(fn, *args)
+
+
+def _run(fn, *args):
+    _get_pool()
+    if not _slots.acquire(blocking=False):
+        raise HashingBusy(wait=settings.PASSWORD_HASHING_RETRY_AFTER)
+    try:
+        pool, future = _submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    # the slot is freed when the job finishes, not when a caller gives up
+    # waiting, so timed-out jobs still count against PASSWORD_HASHING_QUEUE
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=settings.PASSWORD_HASHING_TIMEOUT)
+    except FuturesTimeoutError:
+        raise HashingBusy(wait=settings.PASSWORD_HASHING_RETRY_AFTER)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise HashingBusy(wait=settings.PASSWORD_HASHING_RETRY_AFTER)
+
+
+def hash_password(password):
+    """
+    Hash a raw password in the hashing pool. Raises HashingBusy when the
+    pool already has PASSWORD_HASHING_QUEUE jobs in flight.
+    """
+    return _run(_hash, password)
+
+
+def verify_password(password, encoded):
+    """
+    Check a raw password against a stored hash in the hashing pool.
+    Returns (ok, new_encoded); new_encoded is set when the hash must be
+    upgraded to the current hasher settings.
+    """
+    return _run(_verify, password, encoded)
+
+
+def new_hashing_pool(max_workers):
+    """
+    Dedicated pool for offline jobs (bulk imports) that may saturate all
+    cores without affecting the request-path pool.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+
+
+def hash_passwords(pool, passwords, chunksize=32):
+    return list(pool.map(_hash, passwords, chunksize=chunksize))
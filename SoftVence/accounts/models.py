@@ -1,7 +1,27 @@
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
+from .hashing import hash_password
 
-class UserManager(BaseUserManager):
+class UserQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(is_active=True)
+
+    def update(self, **kwargs):
+        # bulk deactivation and role changes skip post_save, so revoke the
+        # affected users' tokens here (their role is a JWT claim)
+        revoked = self.none()
+        if "is_active" in kwargs and not kwargs["is_active"]:
+            revoked = self
+        elif "role" in kwargs:
+            revoked = self.exclude(role=kwargs["role"])
+        user_ids = list(revoked.values_list("id", flat=True))
+        updated = super().update(**kwargs)
+        if user_ids:
+            from .authentication import revoke_user_tokens
+            revoke_user_tokens(*user_ids)
+        return updated
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     def create_user(self, email, password=None, role="customer", **extra_fields):
         if not email:
             raise ValueError("Email is required")
@@ -9,7 +29,10 @@ class UserManager(BaseUserManager):
         email = self.normalize_email(email)
         extra_fields.setdefault("is_active", True)
         user = self.model(email=email, role=role, **extra_fields)
-        user.set_password(password)
+        if password is None:
+            user.set_unusable_password()
+        else:
+            user.password = hash_password(password)
         user.save(using=self._db)
         return user
 
@@ -20,9 +43,6 @@ class UserManager(BaseUserManager):
         user.save()
         return user
 
-    def active(self):
-        return self.filter(is_active=True)
-
 class User(AbstractBaseUser, PermissionsMixin):
     ROLE_CHOICES = (
         ("customer", "Customer"),
@@ -44,6 +64,13 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        # the role as loaded, so accounts.signals can tell a role change
+        user._loaded_role = dict(zip(field_names, values)).get("role")
+        return user
     
     def __str__(self):
         return f"{self.get_username()}"
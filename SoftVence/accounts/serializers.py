@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from .models import User
-from rest_framework_simplejwt.tokens import RefreshToken
+from .authentication import ClaimsRefreshToken
 from django.contrib.auth import authenticate
 from common import ValidationError
 
@@ -52,7 +52,7 @@ class LoginSerializer(serializers.Serializer):
         if not user:
             raise ValidationError("Invalid credentials")
 
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
 
         return {
             "refresh": str(refresh),
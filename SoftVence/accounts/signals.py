@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .authentication import revoke_user_tokens
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def revoke_inactive_user_tokens(sender, instance, created, **kwargs):
+    # deactivated, or the role claim in issued tokens is stale
+    loaded_role = getattr(instance, "_loaded_role", None)
+    if not created and (not instance.is_active or (loaded_role is not None and loaded_role != instance.role)):
+        revoke_user_tokens(instance.pk)
+    instance._loaded_role = instance.role
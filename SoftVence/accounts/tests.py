@@ -1,3 +1,46 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from accounts.authentication import REVOKED_KEY, ClaimsJWTAuthentication, ClaimsRefreshToken
+from accounts.models import User
 
-# Create your tests here.
+
+class TokenRevocationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="customer@example.com", password=None, role="customer")
+        self.other = User.objects.create_user(email="other@example.com", password=None, role="customer")
+
+    def assertRevoked(self, user, revoked=True):
+        self.assertEqual(cache.get(REVOKED_KEY.format(user.id)) is not None, revoked)
+
+    def test_access_token_is_rejected_after_bulk_deactivation(self):
+        authentication = ClaimsJWTAuthentication()
+        token = authentication.get_validated_token(str(ClaimsRefreshToken.for_user(self.user).access_token))
+        self.assertEqual(authentication.get_claims_user(token).role, "customer")
+
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            authentication.get_claims_user(token)
+
+    def test_bulk_role_change_revokes_changed_users_only(self):
+        self.other.role = "vendor"
+        self.other.save()
+        cache.clear()
+
+        User.objects.filter(id__in=[self.user.id, self.other.id]).update(role="vendor")
+        self.assertRevoked(self.user)
+        self.assertRevoked(self.other, revoked=False)
+
+    def test_role_change_on_save_revokes(self):
+        user = User.objects.get(id=self.user.id)
+        user.role = "vendor"
+        user.save()
+        self.assertRevoked(self.user)
+
+    def test_unrelated_changes_do_not_revoke(self):
+        user = User.objects.get(id=self.user.id)
+        user.first_name = "Rahim"
+        user.save()
+        User.objects.filter(id=self.user.id).update(last_name="Uddin")
+        self.assertRevoked(self.user, revoked=False)
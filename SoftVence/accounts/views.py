@@ -3,6 +3,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework import status
 from common.validation_err import ValidationError
 from .serializers import SignupSerializer, LoginSerializer
+from .hashing import HashingBusy
 from drf_spectacular.utils import extend_schema, inline_serializer
 from rest_framework import serializers as drf_serializers
 from common import Response
@@ -173,6 +174,8 @@ class LoginAPIView(APIView):
                 message=e.detail["message"],
                 status_code=e.detail["status_code"],
             )
+        except HashingBusy:
+            raise
         except Exception as e:
             str_errors = str(e).strip("[]\"'")
             return Response(
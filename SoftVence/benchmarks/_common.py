@@ -0,0 +1,123 @@
+"""
+Shared setup for the benchmark scripts.
+
+Run a script from the project root, e.g. `python -m benchmarks.bench_export`,
+against a development database. Seed data is written inside a transaction
+that is rolled back when the script ends.
+"""
+import argparse
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "merketLink.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import transaction  # noqa: E402
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    try:
+        with transaction.atomic():
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+def parser(description, rows=1000):
+    """A list default for `rows` makes --rows take several sizes."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--rows", type=int, nargs="+" if isinstance(rows, list) else None, default=rows)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser
+
+
+def timed(label, fn, repeat=5, rows=None):
+    """Run `fn` `repeat` times and print the best wall time."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    rate = f" ({rows / best:,.0f} rows/s)" if rows else ""
+    print(f"{label:<40} {best * 1000:10.2f} ms{rate}")
+    return result
+
+
+def count_queries(fn):
+    """Run `fn` once and return the number of queries it issued."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        fn()
+    return len(queries)
+
+
+def seed_catalog(stock=1_000_000):
+    from accounts.models import User
+    from services.models import Service, ServiceVariant
+    from vendors.models import Vendor
+
+    tag = uuid.uuid4().hex[:8]
+    vendor_user = User.objects.create_user(email=f"bench-vendor-{tag}@example.com", password=None, role="vendor")
+    customer = User.objects.create_user(email=f"bench-customer-{tag}@example.com", password=None, role="customer")
+    vendor = Vendor.objects.create(user=vendor_user, business_name=f"Bench {tag}", address="-")
+    service = Service.objects.create(vendor=vendor, name=f"Bench service {tag}", is_approved=True)
+    variant = ServiceVariant.objects.create(
+        service=service, name="Standard", price=Decimal("500.00"),
+        estimated_minutes=timedelta(minutes=30), stock=stock,
+    )
+    return customer, vendor, variant
+
+
+def seed_orders(rows, status="completed"):
+    """Bulk insert `rows` orders for one vendor/customer; returns (customer, vendor, variant)."""
+    from orders.models import RepairOrder
+
+    customer, vendor, variant = seed_catalog()
+    RepairOrder.objects.bulk_create(
+        [
+            RepairOrder(customer=customer, vendor=vendor, variant=variant, total_amount=variant.price, status=status)
+            for _ in range(rows)
+        ],
+        batch_size=2000,
+    )
+    return customer, vendor, variant
+
+
+def seed_services(rows, variants=3):
+    """Bulk insert `rows` approved services with `variants` variants each; returns the vendor."""
+    from services.models import Service, ServiceVariant
+
+    _, vendor, _ = seed_catalog()
+    services = Service.objects.bulk_create(
+        [Service(vendor=vendor, name=f"Service {i}", is_approved=True) for i in range(rows)],
+        batch_size=2000,
+    )
+    ServiceVariant.objects.bulk_create(
+        [
+            ServiceVariant(
+                service=service, name=f"Variant {n}", price=Decimal("500.00"),
+                estimated_minutes=timedelta(minutes=30), stock=10,
+            )
+            for service in services
+            for n in range(variants)
+        ],
+        batch_size=2000,
+    )
+    return vendor
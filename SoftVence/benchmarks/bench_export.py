@@ -0,0 +1,51 @@
+"""
+Order export: streaming_export (server-side cursor, chunked) against
+serialising the whole queryset in memory, for both export formats.
+
+    python -m benchmarks.bench_export --rows 50000
+"""
+import csv
+import io
+import tracemalloc
+from benchmarks._common import parser, rolled_back, seed_orders, timed
+from common.export import streaming_export
+from orders.models import RepairOrder
+from orders.views import OrderExportAPIView
+
+
+def _stream(queryset, file_format):
+    response = streaming_export(queryset, OrderExportAPIView.EXPORT_FIELDS, "orders", file_format)
+    return sum(len(chunk) for chunk in response.streaming_content)
+
+
+def _in_memory(queryset):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(OrderExportAPIView.EXPORT_FIELDS)
+    writer.writerows(list(queryset.values_list(*OrderExportAPIView.EXPORT_FIELDS)))
+    return len(buffer.getvalue())
+
+
+def _peak(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    args = parser(__doc__, rows=20000).parse_args()
+    with rolled_back():
+        _, vendor, _ = seed_orders(args.rows)
+        queryset = RepairOrder.objects.filter(vendor=vendor).order_by("id")
+
+        timed("in-memory csv", lambda: _in_memory(queryset), args.repeat, args.rows)
+        timed("streaming csv", lambda: _stream(queryset, "csv"), args.repeat, args.rows)
+        timed("streaming jsonl", lambda: _stream(queryset, "jsonl"), args.repeat, args.rows)
+        print(f"peak memory in-memory csv: {_peak(lambda: _in_memory(queryset)):.1f} MiB")
+        print(f"peak memory streaming csv: {_peak(lambda: _stream(queryset, 'csv')):.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Invoice delivery throughput: deliver_pending_invoices over one locmem mail
+connection. Rendered files go to a temporary MEDIA_ROOT.
+
+    python -m benchmarks.bench_invoices --rows 2000
+"""
+import tempfile
+from django.test import override_settings
+from benchmarks._common import parser, rolled_back, seed_orders, timed
+from orders.models import RepairOrder
+from payments.invoices import deliver_pending_invoices
+from payments.models import Invoice
+
+
+def main():
+    args = parser(__doc__).parse_args()
+    with tempfile.TemporaryDirectory() as media_root, override_settings(
+        MEDIA_ROOT=media_root, EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    ):
+        with rolled_back():
+            _, vendor, _ = seed_orders(args.rows, status="paid")
+            order_ids = list(RepairOrder.objects.filter(vendor=vendor).values_list("id", flat=True))
+
+            def deliver():
+                Invoice.objects.filter(order_id__in=order_ids).delete()
+                Invoice.objects.bulk_create([Invoice(order_id=order_id, number=f"INV-{order_id:08d}") for order_id in order_ids])
+                return deliver_pending_invoices()
+
+            sent = timed("deliver_pending_invoices", deliver, args.repeat, args.rows)
+            print(f"sent per run: {sent}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+List serialization, query included, at each --rows size:
+
+- orders: RepairOrderRetriveListSerializer over select_related model
+  instances against RepairOrderListProjection over values() rows
+- services: ServiceRetriveListSerializer over catalog() (select_related
+  plus prefetched variants) against ServiceListProjection over values()
+  rows, three variants per service
+
+Reports wall time, queries issued, and whether the output is identical.
+
+    python -m benchmarks.bench_projection --rows 1000 10000
+"""
+from benchmarks._common import count_queries, parser, rolled_back, seed_orders, seed_services, timed
+from orders.models import RepairOrder
+from orders.serializers import RepairOrderListProjection, RepairOrderRetriveListSerializer
+from services.models import Service
+from services.serializers import ServiceListProjection, ServiceRetriveListSerializer
+
+
+def compare(label, model_serializer, projection, rows, repeat):
+    print(f"-- {label}, {rows:,} rows")
+    stock = timed(f"ModelSerializer ({count_queries(model_serializer)} queries)", model_serializer, repeat, rows)
+    fast = timed(f"values() projection ({count_queries(projection)} queries)", projection, repeat, rows)
+    print(f"identical output: {[dict(row) for row in stock] == fast}")
+
+
+def bench_orders(rows, repeat):
+    _, vendor, _ = seed_orders(rows)
+    orders = RepairOrder.objects.filter(vendor=vendor).order_by("-created_at", "-id")
+
+    def model_serializer():
+        queryset = orders.select_related("customer", "vendor__user", "variant")
+        return RepairOrderRetriveListSerializer(queryset, many=True).data
+
+    def projection():
+        return RepairOrderListProjection(orders.values(*RepairOrderListProjection.columns), many=True).data
+
+    compare("orders", model_serializer, projection, rows, repeat)
+
+
+def bench_services(rows, repeat):
+    vendor = seed_services(rows)
+    services = Service.objects.filter(vendor=vendor).order_by("-id")
+
+    def model_serializer():
+        return ServiceRetriveListSerializer(services.catalog(), many=True).data
+
+    def projection():
+        return ServiceListProjection(services.in_catalog().values(*ServiceListProjection.columns), many=True).data
+
+    compare("services", model_serializer, projection, rows, repeat)
+
+
+def main():
+    args = parser(__doc__, rows=[1000, 10000]).parse_args()
+    for rows in args.rows:
+        with rolled_back():
+            bench_orders(rows, args.repeat)
+            bench_services(rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+JSON rendering of one order history page: DRF's JSONRenderer against
+common.renderers.ORJSONRenderer on the same serialized data.
+
+    python -m benchmarks.bench_renderer --rows 1000
+"""
+from rest_framework.renderers import JSONRenderer
+from benchmarks._common import parser, rolled_back, seed_orders, timed
+from common.renderers import ORJSONRenderer
+from orders.models import RepairOrder
+from orders.serializers import RepairOrderListProjection
+
+
+def main():
+    args = parser(__doc__).parse_args()
+    with rolled_back():
+        _, vendor, _ = seed_orders(args.rows)
+        rows = RepairOrder.objects.filter(vendor=vendor).values(*RepairOrderListProjection.columns)
+        data = {"next": None, "previous": None, "results": RepairOrderListProjection(rows, many=True).data}
+
+    stock = timed("JSONRenderer", lambda: JSONRenderer().render(data), args.repeat, args.rows)
+    fast = timed("ORJSONRenderer", lambda: ORJSONRenderer().render(data), args.repeat, args.rows)
+    print(f"identical output: {stock == fast} ({len(fast):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
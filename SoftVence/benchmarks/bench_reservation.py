@@ -0,0 +1,92 @@
+"""
+Checkout throughput on one hot variant: --threads workers, each on its own
+database connection, create orders (order row + reserve_stock in one
+transaction, as CreateOrderAPIView does) against a single variant.
+
+Reports orders/s and the time spent in UPDATE statements, which is where
+the workers wait on each other's row locks. The order transaction locks
+only the variant row; the service's total_stock is adjusted after commit.
+(Adjusting it inside the transaction held the Service row lock until
+commit and serialised every order for the service.)
+
+Needs PostgreSQL. Seed data is committed so the workers can see it, and
+deleted at the end.
+
+    python -m benchmarks.bench_reservation --threads 16 --rows 2000
+"""
+import statistics
+import threading
+import time
+from django.db import connection, transaction
+from benchmarks._common import parser, seed_catalog
+from common import ValidationError
+from orders.models import RepairOrder
+from orders.reservations import reserve_stock
+
+
+def _update_timer(waits):
+    def wrapper(execute, sql, params, many, context):
+        if not sql.lstrip().upper().startswith("UPDATE"):
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            waits.append(time.perf_counter() - started)
+    return wrapper
+
+
+def _worker(customer, vendor, variant, count, placed, waits):
+    try:
+        with connection.execute_wrapper(_update_timer(waits)):
+            for _ in range(count):
+                try:
+                    with transaction.atomic():
+                        order = RepairOrder.objects.create(
+                            customer=customer, vendor=vendor, variant=variant, total_amount=variant.price,
+                        )
+                        reserve_stock(order)
+                except ValidationError:
+                    break  # sold out
+                placed.append(order.id)
+    finally:
+        connection.close()
+
+
+def main():
+    cli = parser(__doc__, rows=2000)
+    cli.add_argument("--threads", type=int, default=8)
+    args = cli.parse_args()
+
+    customer, vendor, variant = seed_catalog(stock=args.rows)
+    try:
+        placed, waits = [], []
+        per_thread = -(-args.rows // args.threads)
+        threads = [
+            threading.Thread(target=_worker, args=(customer, vendor, variant, per_thread, placed, waits))
+            for _ in range(args.threads)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        variant.refresh_from_db()
+        print(f"{len(placed)} orders from {args.threads} threads in {elapsed:.2f}s ({len(placed) / elapsed:,.0f} orders/s)")
+        print(f"variant stock left: {variant.stock} (expected {args.rows - len(placed)})")
+        if waits:
+            waits.sort()
+            print(
+                f"UPDATE time (row lock waits) ms: p50 {statistics.median(waits) * 1000:.2f} "
+                f"p95 {waits[int(len(waits) * 0.95)] * 1000:.2f} max {waits[-1] * 1000:.2f} "
+                f"total {sum(waits):.2f}s over {len(waits)} statements"
+            )
+    finally:
+        vendor.user.delete()
+        customer.delete()
+
+
+if __name__ == "__main__":
+    main()
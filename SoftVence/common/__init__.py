@@ -1,3 +1,4 @@
 from .response import Response
 from .validation_err import ValidationError
-from .permission import IsVendorOrAdmin, IsAdminOrReadOnly
\ No newline at end of file
+from .permission import IsVendorOrAdmin, IsAdminOrReadOnly, OwnedQuerysetMixin
+from .pagination import CursorPagination
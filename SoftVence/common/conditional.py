@@ -0,0 +1,30 @@
+import hashlib
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(":".join(str(p) for p in parts).encode()).hexdigest())
+
+
+def conditional_response(request, respond, etag=None, last_modified=None):
+    """
+    Answer 304 Not Modified when the client's If-None-Match /
+    If-Modified-Since already match the given validators; otherwise call
+    respond() and stamp the validators on its response.
+
+    Validators must be cheap (a cache version or an aggregate), since they
+    are computed before the body is built.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = respond()
+    if response.status_code in (200, 304):
+        if etag:
+            response["ETag"] = etag
+        if timestamp:
+            response["Last-Modified"] = http_date(timestamp)
+    # authenticated data: only the client may keep it, and must revalidate
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
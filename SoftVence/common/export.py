@@ -0,0 +1,42 @@
+import csv
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from .validation_err import ValidationError
+
+EXPORT_FORMATS = ("csv", "jsonl")
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def streaming_export(queryset, fields, filename, file_format):
+    """
+    Stream `queryset.values_list(*fields)` as CSV or JSON lines. Rows are
+    read through a server-side cursor in chunks of EXPORT_CHUNK_SIZE, so
+    memory stays flat whatever the export size.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValidationError("export_format must be csv or jsonl")
+
+    rows = queryset.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    if file_format == "csv":
+        writer = csv.writer(_Echo())
+        stream = (writer.writerow(row) for row in _with_header(fields, rows))
+        content_type = "text/csv"
+    else:
+        encoder = DjangoJSONEncoder()
+        stream = (encoder.encode(dict(zip(fields, row))) + "\n" for row in rows)
+        content_type = "application/x-ndjson"
+
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{file_format}"'
+    return response
+
+
+def _with_header(fields, rows):
+    yield fields
+    yield from rows
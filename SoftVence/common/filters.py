@@ -0,0 +1,55 @@
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .validation_err import ValidationError
+
+
+def _day_start(date):
+    return timezone.make_aware(datetime.combine(date, time.min))
+
+
+def parse_date_param(request, param, default=None):
+    """
+    The YYYY-MM-DD query param as a date, `default` when it is missing.
+    Raises ValidationError for malformed or impossible dates.
+    """
+    value = request.query_params.get(param)
+    if not value:
+        return default
+    try:
+        date = parse_date(value)
+    except ValueError:
+        date = None
+    if not date:
+        raise ValidationError(f"{param} must be a date (YYYY-MM-DD)")
+    return date
+
+
+def list_filters(request, statuses, date_field="created_at", vendor_field="vendor_id"):
+    """
+    ORM filter kwargs from the list/export query params: date_from, date_to
+    (YYYY-MM-DD, inclusive), status and vendor.
+
+    Dates become a half-open range on the raw column rather than a
+    `__date` lookup, so the filter can use a (..., created_at) index.
+    """
+    filters = {}
+    date_from = parse_date_param(request, "date_from")
+    if date_from:
+        filters[f"{date_field}__gte"] = _day_start(date_from)
+    date_to = parse_date_param(request, "date_to")
+    if date_to:
+        filters[f"{date_field}__lt"] = _day_start(date_to + timedelta(days=1))
+
+    status = request.query_params.get("status")
+    if status:
+        if status not in dict(statuses):
+            raise ValidationError("Invalid status")
+        filters["status"] = status
+
+    vendor = request.query_params.get("vendor")
+    if vendor:
+        if not vendor.isdigit():
+            raise ValidationError("vendor must be an id")
+        filters[vendor_field] = int(vendor)
+    return filters
@@ -0,0 +1,106 @@
+from rest_framework.pagination import BasePagination, CursorPagination as DRFCursorPagination
+from rest_framework.utils.urls import replace_query_param
+from .response import Response
+
+
+class CursorPagination(DRFCursorPagination):
+    """
+    Keyset pagination on the primary key.
+
+    Pages are fetched with `WHERE id < <cursor> ORDER BY id DESC LIMIT n`,
+    so every page costs the same at any depth and no COUNT(*) is issued.
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
+
+    def get_paginated_response(self, data):
+        return Response(
+            data={
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "success": {"type": "boolean"},
+                "status_code": {"type": "integer"},
+                "message": {"type": "string"},
+                "data": super().get_paginated_response_schema(schema),
+            },
+        }
+
+
+class OffsetPagination(BasePagination):
+    """
+    Page-number pagination for result sets that have no stable keyset,
+    such as relevance ranked search.
+
+    Reads page_size + 1 rows to know whether a next page exists, so no
+    COUNT(*) is issued; `max_page` bounds how deep a client can go.
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    page_query_param = "page"
+    max_page = 50
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page = self._positive_int(request.query_params.get(self.page_query_param), 1, self.max_page)
+        self.page_size = self._positive_int(
+            request.query_params.get(self.page_size_query_param), self.page_size, self.max_page_size
+        )
+        offset = (self.page - 1) * self.page_size
+        rows = list(queryset[offset:offset + self.page_size + 1])
+        self.has_next = len(rows) > self.page_size and self.page < self.max_page
+        return rows[:self.page_size]
+
+    def _positive_int(self, value, default, maximum):
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return default
+        return min(max(value, 1), maximum)
+
+    def _page_link(self, page):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, page)
+
+    def get_paginated_response(self, data):
+        return Response(
+            data={
+                "next": self._page_link(self.page + 1) if self.has_next else None,
+                "previous": self._page_link(self.page - 1) if self.page > 1 else None,
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "success": {"type": "boolean"},
+                "status_code": {"type": "integer"},
+                "message": {"type": "string"},
+                "data": {
+                    "type": "object",
+                    "properties": {
+                        "next": {"type": "string", "nullable": True},
+                        "previous": {"type": "string", "nullable": True},
+                        "results": schema,
+                    },
+                },
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {"name": self.page_query_param, "required": False, "in": "query", "schema": {"type": "integer"}},
+            {"name": self.page_size_query_param, "required": False, "in": "query", "schema": {"type": "integer"}},
+        ]
@@ -6,21 +6,47 @@ class IsAdminOrReadOnly(BasePermission):
             return True
         return request.user.is_authenticated and request.user.role == "admin"
 
-class IsVendorOrAdmin:
+
+def owner_id_of(obj):
+    """
+    Id of the user owning obj, read from already loaded columns: the
+    `owner_id` annotation (Service/ServiceVariant querysets `with_owner()`)
+    or a direct `user_id` (Vendor). Never follows a relation.
+    """
+    owner_id = getattr(obj, "owner_id", None)
+    if owner_id is None:
+        owner_id = getattr(obj, "user_id", None)
+    return owner_id
+
+
+class IsVendorOrAdmin(BasePermission):
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.role in ["vendor", "admin"]
 
     def has_object_permission(self, request, view, obj):
-        obj_usr = None
-        if hasattr(obj, 'user'):
-            obj_usr = obj.user
-        elif hasattr(obj, 'service'):
-            obj_usr = obj.service.vendor.user
-        elif hasattr(obj, 'vendor'):
-            obj_usr = obj.vendor.user
-        else:
-            return False
-        
         if request.user.role == "admin":
             return True
-        return obj_usr == request.user
+        owner_id = owner_id_of(obj)
+        return owner_id is not None and owner_id == request.user.id
+
+
+class OwnedQuerysetMixin:
+    """
+    Scopes a view's queryset to the request user's own rows in SQL; admins
+    see everything.
+
+    `owner_lookup` reaches the owning user id, `vendor_lookup` the vendor
+    id. The latter is used when the user carries a `vendor_id` (JWT claims
+    user), which skips the join to vendors.
+    """
+    owner_lookup = None
+    vendor_lookup = None
+
+    def scope_to_owner(self, queryset):
+        user = self.request.user
+        if user.role == "admin":
+            return queryset
+        vendor_id = getattr(user, "vendor_id", None)
+        if vendor_id is not None and self.vendor_lookup:
+            return queryset.filter(**{self.vendor_lookup: vendor_id})
+        return queryset.filter(**{self.owner_lookup: user.id})
@@ -0,0 +1,53 @@
+from decimal import Decimal
+from django.utils import timezone
+from django.utils.duration import duration_string
+from rest_framework import serializers
+
+
+def decimal_str(value, places=2):
+    """DecimalField(decimal_places=places) output: fixed point string."""
+    if value is None:
+        return None
+    return format(value.quantize(Decimal(1).scaleb(-places)), "f")
+
+
+def duration_str(value):
+    return duration_string(value) if value is not None else None
+
+
+def datetime_str(value):
+    """DateTimeField output: ISO 8601 in the current timezone, UTC as 'Z'."""
+    if value is None:
+        return None
+    value = timezone.localtime(value).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class ProjectionListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        rows = list(data)
+        self.child.prepare(rows)
+        return [self.child.to_representation(row) for row in rows]
+
+
+class ProjectionSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer over `values()` rows for high-volume list paths.
+
+    Subclasses list the columns they read in `columns` (pass them to
+    `queryset.values()`) and build the response dict by hand in
+    to_representation(), matching the JSON of the ModelSerializer they
+    stand in for. prepare() runs once per page, e.g. to fetch the rows
+    of a to-many relation in a single query.
+    """
+    columns = ()
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        kwargs["child"] = cls(context=kwargs.get("context", {}))
+        return ProjectionListSerializer(*args, **kwargs)
+
+    def prepare(self, rows):
+        pass
@@ -0,0 +1,41 @@
+import json
+import time
+from django.conf import settings
+from .utils import r
+
+
+def _lane_keys(queue):
+    options = settings.CELERY_BROKER_TRANSPORT_OPTIONS
+    sep = options["sep"]
+    return [queue if not step else f"{queue}{sep}{step}" for step in options["priority_steps"]]
+
+
+def _enqueued_at(raw):
+    try:
+        return json.loads(raw)["headers"].get("enqueued_at")
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def lane_stats():
+    """
+    Depth and oldest-task wait (seconds) of every Celery lane, read
+    straight from the Redis broker lists.
+    """
+    now = time.time()
+    stats = {}
+    for queue in settings.CELERY_TASK_QUEUES:
+        keys = _lane_keys(queue.name)
+        pipe = r.pipeline()
+        for key in keys:
+            pipe.llen(key)
+            pipe.lindex(key, -1)  # LPUSH/BRPOP: the oldest message is at the tail
+        results = pipe.execute()
+
+        depth = sum(results[0::2])
+        waits = [now - ts for ts in map(_enqueued_at, filter(None, results[1::2])) if ts]
+        stats[queue.name] = {
+            "depth": depth,
+            "oldest_wait_seconds": round(max(waits), 3) if waits else 0,
+        }
+    return stats
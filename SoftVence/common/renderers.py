@@ -0,0 +1,32 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson.
+
+    str/int/dict/list, UUID and datetime (incl. their DRF subclasses such as
+    ReturnDict and ErrorDetail) are encoded in C; anything else (Decimal,
+    timedelta, lazy strings, querysets) goes through DRF's own encoder
+    hook. U+2028/U+2029 are escaped as JSONRenderer does. Floats are
+    formatted differently (1e16 vs 1e+16) and NaN/Infinity become null
+    where JSONRenderer raises. Indented output (browsable API) and a
+    missing orjson use the stock renderer.
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson else 0
+    _default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=self._default, option=self.options)
+        # JavaScript line terminators, escaped so the JSON is also valid JS
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
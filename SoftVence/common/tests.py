@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import skipUnless
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+from common import renderers
+from common.renderers import ORJSONRenderer
+
+
+@skipUnless(renderers.orjson, "orjson is not installed")
+class ORJSONRendererTests(SimpleTestCase):
+    def assertSameAsJSONRenderer(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_matches_json_renderer(self):
+        self.assertSameAsJSONRenderer({
+            "id": uuid.UUID(int=1),
+            "name": "Écran cassé",
+            "price": Decimal("500.00"),
+            "estimated_minutes": timedelta(minutes=30),
+            "created_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "results": [1, None, True],
+        })
+
+    def test_escapes_javascript_line_terminators(self):
+        data = {"notes": "line\u2028separator\u2029paragraph"}
+        self.assertEqual(ORJSONRenderer().render(data), b'{"notes":"line\\u2028separator\\u2029paragraph"}')
+        self.assertSameAsJSONRenderer(data)
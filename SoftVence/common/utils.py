@@ -1,7 +1,8 @@
+from django.conf import settings
 from redis import Redis
 import uuid
 
-r = Redis()
+r = Redis.from_url(settings.REDIS_URL)
 
 def acquire_lock(key, ttl=10):
     token = str(uuid.uuid4())
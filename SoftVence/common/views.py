@@ -0,0 +1,19 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import PermissionDenied
+from drf_spectacular.utils import extend_schema
+from .queues import lane_stats
+from .response import Response
+
+
+class QueueStatsAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Celery lane stats",
+        description="Depth and oldest task wait per Celery queue. Only admin can access.",
+    )
+    def get(self, request):
+        if request.user.role != "admin":
+            raise PermissionDenied("Only admin can view queue stats")
+        return Response(data=lane_stats())
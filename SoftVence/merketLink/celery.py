@@ -1,8 +1,17 @@
 import os
+import time
 from celery import Celery
+from celery.signals import before_task_publish
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "merketLink.settings")
 
 app = Celery("marketlink")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+
+
+@before_task_publish.connect
+def stamp_enqueued_at(headers=None, **kwargs):
+    # read by common.queues.lane_stats to report how long a lane's oldest task has waited
+    if headers is not None:
+        headers.setdefault("enqueued_at", time.time())
@@ -4,6 +4,8 @@ from pathlib import Path
 import stripe
 from datetime import timedelta
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
+from kombu import Queue
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -40,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     *CUSTOM_APPS,
     "rest_framework",
     "django_celery_beat",
@@ -115,6 +118,25 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+PASSWORD_HASHERS = [
+    "accounts.hashing.ConfigurablePBKDF2PasswordHasher",
+    # Django's defaults, so existing hashes still verify and get upgraded
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+AUTHENTICATION_BACKENDS = ["accounts.backends.PooledModelBackend"]
+
+# Password hashing runs in a process pool of PASSWORD_HASHING_WORKERS per web
+# worker; beyond PASSWORD_HASHING_QUEUE jobs in flight requests get a 503.
+PASSWORD_HASH_ITERATIONS = config("PASSWORD_HASH_ITERATIONS", default=1_000_000, cast=int)
+PASSWORD_HASHING_WORKERS = config("PASSWORD_HASHING_WORKERS", default=2, cast=int)
+PASSWORD_HASHING_QUEUE = config("PASSWORD_HASHING_QUEUE", default=8, cast=int)
+PASSWORD_HASHING_TIMEOUT = config("PASSWORD_HASHING_TIMEOUT", default=10, cast=float)
+PASSWORD_HASHING_RETRY_AFTER = config("PASSWORD_HASHING_RETRY_AFTER", default=1, cast=int)
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
 
@@ -138,11 +160,20 @@ MEDIA_ROOT = BASE_DIR / "uploads"
 DOMAIN = config("DOMAIN", default="http://localhost:8000")
 
 # Restframework and JWT Config
+# JSON rendering: FAST_JSON_RENDERER=1 renders every response with orjson (common.renderers)
+FAST_JSON_RENDERER = config("FAST_JSON_RENDERER", default=False, cast=bool)
+
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "common.renderers.ORJSONRenderer" if FAST_JSON_RENDERER else "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.ClaimsJWTAuthentication",
     ),
+    "DEFAULT_PAGINATION_CLASS": "common.pagination.CursorPagination",
+    "PAGE_SIZE": 20,
 }
 
 SIMPLE_JWT = {
@@ -156,9 +187,51 @@ STRIPE_SECRET_KEY = config("STRIPE_SECRET_KEY")
 STRIPE_PUBLISHABLE_KEY = config("STRIPE_PUBLISHABLE_KEY")
 stripe.api_key = STRIPE_SECRET_KEY
 
+# Stripe client (payments.stripe_client); STRIPE_API_BASE points it at a local stand-in
+STRIPE_API_BASE = config("STRIPE_API_BASE", default=None)
+STRIPE_CONNECT_TIMEOUT = config("STRIPE_CONNECT_TIMEOUT", default=3.05, cast=float)
+STRIPE_READ_TIMEOUT = config("STRIPE_READ_TIMEOUT", default=10, cast=float)
+STRIPE_MAX_RETRIES = config("STRIPE_MAX_RETRIES", default=2, cast=int)
+STRIPE_POOL_SIZE = config("STRIPE_POOL_SIZE", default=10, cast=int)
+STRIPE_BREAKER_FAILURE_RATE = config("STRIPE_BREAKER_FAILURE_RATE", default=0.5, cast=float)
+STRIPE_BREAKER_MIN_CALLS = config("STRIPE_BREAKER_MIN_CALLS", default=10, cast=int)
+STRIPE_BREAKER_RESET_TIMEOUT = config("STRIPE_BREAKER_RESET_TIMEOUT", default=30, cast=float)
+
 # Webhook secret
 STRIPE_WEBHOOK_SECRET = config("STRIPE_WEBHOOK_SECRET")
 
+# Build the checkout session in Celery and answer order creation with 202.
+# Clients can also opt in per request with "async_checkout": true.
+ORDER_ASYNC_CHECKOUT = config("ORDER_ASYNC_CHECKOUT", default=False, cast=bool)
+
+# Seconds a new order holds its stock before an unpaid checkout is released.
+# The Checkout session closes with the reservation and Stripe needs at least 30 minutes.
+STOCK_RESERVATION_TTL = config("STOCK_RESERVATION_TTL", default=60 * 60, cast=int)
+if STOCK_RESERVATION_TTL < 31 * 60:
+    raise ImproperlyConfigured("STOCK_RESERVATION_TTL must be at least 1860 seconds (31 minutes)")
+
+# Seconds an order stays "processing" before complete_processing marks it completed
+ORDER_PROCESSING_SECONDS = config("ORDER_PROCESSING_SECONDS", default=30, cast=int)
+
+# Vendor order rollups: the beat task re-checks the last N days every interval (seconds)
+ORDER_ROLLUP_RECONCILE_DAYS = config("ORDER_ROLLUP_RECONCILE_DAYS", default=7, cast=int)
+ORDER_ROLLUP_RECONCILE_INTERVAL = config("ORDER_ROLLUP_RECONCILE_INTERVAL", default=60 * 60, cast=int)
+
+# Email (invoices); console backend unless configured
+EMAIL_BACKEND = config("EMAIL_BACKEND", default="django.core.mail.backends.console.EmailBackend")
+EMAIL_HOST = config("EMAIL_HOST", default="localhost")
+EMAIL_PORT = config("EMAIL_PORT", default=25, cast=int)
+EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
+EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
+EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=False, cast=bool)
+EMAIL_FILE_PATH = BASE_DIR / "sent_emails"
+DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="MarketLink <no-reply@marketlink.local>")
+
+# Invoices are rendered and mailed in batches of INVOICE_BATCH_SIZE,
+# at most INVOICE_BATCH_WINDOW seconds after an order is paid
+INVOICE_BATCH_SIZE = config("INVOICE_BATCH_SIZE", default=200, cast=int)
+INVOICE_BATCH_WINDOW = config("INVOICE_BATCH_WINDOW", default=10, cast=int)
+
 # CSRF Trusted Origins
 CSRF_TRUSTED_ORIGINS = [
     config("CSRF_TRUSTED_ORIGINS", default="http://localhost:8000"),
@@ -184,6 +257,59 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_TIMEZONE = "Asia/Dhaka"
 
+# Task lanes: each queue gets its own worker pool (see Docker-compose.yml).
+# Lower priority value runs first within a queue (Redis priority steps 0/3/6/9).
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_QUEUES = (
+    Queue("payments"),
+    Queue("orders"),
+    Queue("notifications"),
+    Queue("bulk"),
+    Queue("default"),
+)
+CELERY_TASK_ROUTES = {
+    "payments.celery.task.build_checkout_session": {"queue": "payments", "priority": 0},
+    "payments.celery.task.process_payment_events": {"queue": "payments", "priority": 0},
+    "payments.celery.task.start_processing": {"queue": "orders", "priority": 3},
+    "payments.celery.task.complete_processing": {"queue": "orders", "priority": 3},
+    "payments.celery.task.complete_stale_orders": {"queue": "orders", "priority": 6},
+    "payments.celery.task.release_expired_stock_reservations": {"queue": "orders", "priority": 6},
+    "payments.celery.task.reconcile_order_rollups": {"queue": "orders", "priority": 9},
+    "payments.celery.task.send_invoice": {"queue": "notifications", "priority": 6},
+    "payments.celery.task.deliver_invoices": {"queue": "notifications", "priority": 6},
+    "services.celery.task.import_catalog": {"queue": "bulk", "priority": 9},
+}
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "priority_steps": [0, 3, 6, 9],
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+CELERY_TASK_DEFAULT_PRIORITY = 6
+CELERY_BEAT_SCHEDULE = {
+    "release-expired-stock-reservations": {
+        "task": "payments.celery.task.release_expired_stock_reservations",
+        "schedule": 60.0,
+    },
+    # completes orders whose complete_processing was never enqueued
+    "complete-stale-orders": {
+        "task": "payments.celery.task.complete_stale_orders",
+        "schedule": 300.0,
+    },
+    "deliver-invoices": {
+        "task": "payments.celery.task.deliver_invoices",
+        "schedule": 60.0,
+    },
+    "reconcile-order-rollups": {
+        "task": "payments.celery.task.reconcile_order_rollups",
+        "schedule": ORDER_ROLLUP_RECONCILE_INTERVAL,
+    },
+    # picks up events whose enqueue was lost
+    "process-payment-events": {
+        "task": "payments.celery.task.process_payment_events",
+        "schedule": 30.0,
+    },
+}
+
 # Call the local and development environment
 if DEBUG and SERVER_TYPE != "production":
     try:
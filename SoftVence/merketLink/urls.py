@@ -4,6 +4,7 @@ from django.urls import path, include
 from django.conf.urls.static import static
 from django.conf import settings
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from common.views import QueueStatsAPIView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -12,6 +13,7 @@ urlpatterns = [
     path("services/", include("services.urls")),
     path("orders/", include("orders.urls")),
     path("payments/", include("payments.urls")),
+    path("queues/stats/", QueueStatsAPIView.as_view(), name="queue-stats"),
     
 ]
 urlpatterns += [
@@ -1,9 +1,19 @@
 from django.contrib import admin
-from .models import RepairOrder
+from .models import RepairOrder, StockReservation, VendorDailyRollup
 
 class RepairOrderAdmin(admin.ModelAdmin):
     list_display = ["id", "order_id", "customer", "vendor", "variant", "status"]
     ordering = ["-id"]
 
+class StockReservationAdmin(admin.ModelAdmin):
+    list_display = ["id", "order", "variant", "quantity", "status", "expires_at"]
+    ordering = ["-id"]
+
+class VendorDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ["id", "vendor", "day", "status", "order_count", "revenue"]
+    ordering = ["-id"]
+
     
 admin.site.register(RepairOrder, RepairOrderAdmin)
+admin.site.register(StockReservation, StockReservationAdmin)
+admin.site.register(VendorDailyRollup, VendorDailyRollupAdmin)
\ No newline at end of file
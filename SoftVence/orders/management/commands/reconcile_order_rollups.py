@@ -0,0 +1,35 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from orders.models import RepairOrder
+from orders.rollups import reconcile_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Correct the vendor daily order rollups against RepairOrder. Checks the last "
+        "--days days, or every day since the first order with --all (initial backfill)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7)
+        parser.add_argument("--all", action="store_true", dest="all_days")
+        parser.add_argument("--window", type=int, default=31, help="Days reconciled per statement.")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        if options["all_days"]:
+            first = RepairOrder.objects.order_by("created_at").values_list("created_at", flat=True).first()
+            if first is None:
+                self.stdout.write("No orders.")
+                return
+            start = timezone.localdate(first)
+        else:
+            start = today - timedelta(days=options["days"] - 1)
+
+        corrected = 0
+        while start <= today:
+            end = min(start + timedelta(days=options["window"] - 1), today)
+            corrected += reconcile_rollups(start, end)
+            start = end + timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f"{corrected} rollup rows corrected."))
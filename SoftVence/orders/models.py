@@ -1,9 +1,37 @@
 import uuid
-from django.db import models
+from django.db import connection, models, transaction
+from django.utils import timezone
 from accounts.models import User
 from vendors.models import Vendor
 from services.models import ServiceVariant
 
+class RepairOrderManager(models.Manager):
+    def transition(self, order_id, source, target):
+        """
+        Move an order from source to target status with a conditional
+        UPDATE. Returns False (and changes nothing) when the order is no
+        longer in source, so retried or duplicate calls are no-ops.
+
+        Moving to failed or cancelled gives the order's stock back in the
+        same transaction, so a crash can never leave it reserved.
+        """
+        if target not in self.model.TRANSITIONS[source]:
+            raise ValueError(f"Order cannot move from {source} to {target}")
+        with transaction.atomic():
+            updated = self.filter(id=order_id, status=source).update(status=target, updated_at=timezone.now())
+            if updated:
+                # move the order between its vendor/day rollup rows
+                vendor_id, created_at, amount = (
+                    self.filter(id=order_id).values_list("vendor_id", "created_at", "total_amount").get()
+                )
+                VendorDailyRollup.objects.apply(
+                    vendor_id, timezone.localdate(created_at), {source: (-1, -amount), target: (1, amount)}
+                )
+                if target in self.model.RELEASES_STOCK:
+                    from .reservations import release_reservation
+                    release_reservation(order_id)
+        return updated == 1
+
 class RepairOrder(models.Model):
     STATUS = (
         ("pending", "Pending"),
@@ -13,6 +41,16 @@ class RepairOrder(models.Model):
         ("failed", "Failed"),
         ("cancelled", "Cancelled"),
     )
+    TRANSITIONS = {
+        "pending": ("paid", "failed", "cancelled"),
+        "paid": ("processing", "cancelled"),
+        "processing": ("completed", "failed"),
+        "completed": (),
+        "failed": (),
+        "cancelled": (),
+    }
+    # statuses that hand the reserved stock back
+    RELEASES_STOCK = ("failed", "cancelled")
 
     order_id = models.UUIDField(default=uuid.uuid4, unique=True)
     customer = models.ForeignKey(User, on_delete=models.CASCADE, related_name="order_customer")
@@ -22,10 +60,103 @@ class RepairOrder(models.Model):
     status = models.CharField(max_length=20, choices=STATUS, default="pending")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = RepairOrderManager()
     
     class Meta:
         ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["customer", "status", "created_at"], name="order_customer_status_idx"),
+            models.Index(fields=["vendor", "status", "created_at"], name="order_vendor_status_idx"),
+            # order history keyset pages
+            models.Index(fields=["customer", "created_at", "id"], name="order_customer_created_idx"),
+            models.Index(fields=["vendor", "created_at", "id"], name="order_vendor_created_idx"),
+            # complete_stale_orders sweep
+            models.Index(fields=["updated_at"], condition=models.Q(status="processing"), name="order_processing_idx"),
+        ]
         
     def __str__(self):
         return f"{self.customer.get_full_name} - {self.order_id}"
 
+
+class StockReservation(models.Model):
+    STATUS = (
+        ("held", "Held"),
+        ("committed", "Committed"),
+        ("released", "Released"),
+    )
+
+    order = models.OneToOneField(RepairOrder, on_delete=models.CASCADE, related_name="stock_reservation")
+    variant = models.ForeignKey(ServiceVariant, on_delete=models.CASCADE, related_name="stock_reservations")
+    quantity = models.PositiveIntegerField(default=1)
+    status = models.CharField(max_length=20, choices=STATUS, default="held")
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            # release_expired_reservations sweep
+            models.Index(fields=["expires_at"], condition=models.Q(status="held"), name="reservation_held_expiry_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.order.order_id} - {self.variant_id} x{self.quantity} ({self.status})"
+
+
+class VendorDailyRollupManager(models.Manager):
+    def apply(self, vendor_id, day, deltas):
+        """
+        Add {status: (order_count, revenue)} deltas to a vendor's rollup
+        rows for day in one `INSERT ... ON CONFLICT DO UPDATE`, so concurrent
+        changes add up instead of overwriting each other.
+        """
+        rows = sorted(deltas.items())
+        table = self.model._meta.db_table
+        values = ", ".join(["(%s, %s, %s, %s, %s, now())"] * len(rows))
+        params = []
+        for status, (order_count, revenue) in rows:
+            params += [vendor_id, day, status, order_count, revenue]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (vendor_id, day, status, order_count, revenue, updated_at)
+                VALUES {values}
+                ON CONFLICT (vendor_id, day, status) DO UPDATE SET
+                    order_count = {table}.order_count + EXCLUDED.order_count,
+                    revenue = {table}.revenue + EXCLUDED.revenue,
+                    updated_at = EXCLUDED.updated_at
+                """,
+                params,
+            )
+
+
+class VendorDailyRollup(models.Model):
+    """
+    Orders and their total_amount per vendor, creation day (TIME_ZONE) and
+    current status. Kept up to date with deltas on order create and
+    RepairOrder.objects.transition(), and reconciled periodically by
+    orders.rollups.reconcile_rollups.
+    """
+    vendor = models.ForeignKey(Vendor, on_delete=models.CASCADE, related_name="daily_rollups")
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=RepairOrder.STATUS)
+    order_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = VendorDailyRollupManager()
+
+    class Meta:
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(fields=["vendor", "day", "status"], name="rollup_vendor_day_status_uniq"),
+        ]
+        indexes = [
+            # admin dashboards across vendors
+            models.Index(fields=["day"], name="rollup_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.vendor_id} - {self.day} - {self.status}"
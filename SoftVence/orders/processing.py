@@ -0,0 +1,31 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from .models import RepairOrder
+
+logger = logging.getLogger(__name__)
+
+# how late complete_processing may run before the sweep takes over
+STALE_PROCESSING_GRACE = 5 * 60
+
+
+def complete_stale_processing(batch_size=500):
+    """
+    Complete processing orders whose complete_processing task never ran,
+    e.g. because the worker died between the status change and the enqueue.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.ORDER_PROCESSING_SECONDS + STALE_PROCESSING_GRACE)
+    order_ids = list(
+        RepairOrder.objects.filter(status="processing", updated_at__lte=cutoff)
+        .values_list("id", flat=True)[:batch_size]
+    )
+    completed = 0
+    for order_id in order_ids:
+        # conditional so a late complete_processing and the sweep never both count
+        if RepairOrder.objects.transition(order_id, "processing", "completed"):
+            completed += 1
+
+    if completed:
+        logger.warning("Completed %s orders stuck in processing.", completed)
+    return completed
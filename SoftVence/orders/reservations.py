@@ -0,0 +1,114 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from common import ValidationError
+from services.cache import invalidate_services
+from services.summary import adjust_total_stock
+from services.models import Service, ServiceVariant
+from .models import RepairOrder, StockReservation
+
+logger = logging.getLogger(__name__)
+
+
+def reserve_stock(order, quantity=1):
+    """
+    Hold stock for a new order.
+
+    The decrement is a single conditional UPDATE (`stock >= quantity`), so
+    the variant row is the only row the order transaction locks. Raises
+    ValidationError when the variant is sold out, rolling back the
+    caller's transaction.
+    """
+    reservation = StockReservation.objects.create(
+        order=order,
+        variant_id=order.variant_id,
+        quantity=quantity,
+        expires_at=timezone.now() + timedelta(seconds=settings.STOCK_RESERVATION_TTL),
+    )
+    updated = ServiceVariant.objects.filter(id=order.variant_id, stock__gte=quantity).update(
+        stock=F("stock") - quantity,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        raise ValidationError("This service variant is out of stock")
+
+    _update_service_stock(order.variant.service_id, -quantity)
+    return reservation
+
+
+def _update_service_stock(service_id, delta):
+    """
+    Apply a variant stock change to the service's total_stock after commit.
+
+    Done in the order transaction, the delta would hold the Service row lock
+    until commit and serialise every order for any variant of the service.
+    After commit it is a short autocommit UPDATE; a delta lost to a crash in
+    between is corrected by `manage.py rebuild_service_summaries`.
+    """
+    def apply():
+        adjust_total_stock(service_id, delta)
+        # every change reaches the detail page; the cached lists only when
+        # the service sells out or comes back in stock
+        listing_changed = Service.objects.filter(id=service_id, total_stock__lte=max(delta, 0)).exists()
+        invalidate_services([service_id], lists=listing_changed)
+
+    transaction.on_commit(apply)
+
+
+def commit_reservation(order_id):
+    """
+    Keep the held stock for a paid order.
+    """
+    return StockReservation.objects.filter(order_id=order_id, status="held").update(
+        status="committed",
+        updated_at=timezone.now(),
+    )
+
+
+def release_reservation(order_id):
+    """
+    Give held or committed stock back to the variant. Called by
+    RepairOrder.objects.transition() when an order fails or is cancelled.
+    Safe to call more than once.
+    """
+    with transaction.atomic():
+        reservation = (
+            StockReservation.objects.select_for_update()
+            .filter(order_id=order_id, status__in=("held", "committed"))
+            .select_related("variant")
+            .first()
+        )
+        if not reservation:
+            return False
+
+        reservation.status = "released"
+        reservation.save(update_fields=["status", "updated_at"])
+        ServiceVariant.objects.filter(id=reservation.variant_id).update(
+            stock=F("stock") + reservation.quantity,
+            updated_at=timezone.now(),
+        )
+        _update_service_stock(reservation.variant.service_id, reservation.quantity)
+    return True
+
+
+def release_expired_reservations(batch_size=500):
+    """
+    Fail pending orders whose reservation ran out and return their stock.
+    """
+    order_ids = list(
+        StockReservation.objects.filter(status="held", expires_at__lte=timezone.now(), order__status="pending")
+        .values_list("order_id", flat=True)[:batch_size]
+    )
+    released = 0
+    for order_id in order_ids:
+        # conditional so a payment landing at the same time wins; the
+        # transition releases the reservation in its own transaction
+        if RepairOrder.objects.transition(order_id, "pending", "failed"):
+            released += 1
+
+    if released:
+        logger.info("Released %s expired stock reservations.", released)
+    return released
@@ -0,0 +1,105 @@
+import logging
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.db import connection
+from django.db.models import Sum
+from django.utils import timezone
+from common.projection import decimal_str
+from .models import RepairOrder, VendorDailyRollup
+
+logger = logging.getLogger(__name__)
+
+# statuses whose total_amount counts as revenue
+REVENUE_STATUSES = ("paid", "processing", "completed")
+
+
+def record_order_created(order):
+    VendorDailyRollup.objects.apply(
+        order.vendor_id, timezone.localdate(order.created_at), {order.status: (1, order.total_amount)}
+    )
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def reconcile_rollups(date_from, date_to):
+    """
+    Correct the rollup rows of [date_from, date_to] against RepairOrder.
+
+    One statement computes actual minus stored per (vendor, day, status) and
+    adds the difference with the same upsert the deltas use. Both sides are
+    read from one snapshot, so deltas committed meanwhile are neither lost
+    nor counted twice. Returns the number of rows corrected.
+    """
+    order_table = RepairOrder._meta.db_table
+    rollup_table = VendorDailyRollup._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {rollup_table} (vendor_id, day, status, order_count, revenue, updated_at)
+            SELECT vendor_id, day, status, SUM(order_count), SUM(revenue), now()
+            FROM (
+                SELECT vendor_id, (created_at AT TIME ZONE %s)::date AS day, status,
+                       COUNT(*) AS order_count, SUM(total_amount) AS revenue
+                FROM {order_table}
+                WHERE created_at >= %s AND created_at < %s
+                GROUP BY 1, 2, 3
+                UNION ALL
+                SELECT vendor_id, day, status, -order_count, -revenue
+                FROM {rollup_table}
+                WHERE day >= %s AND day <= %s
+            ) AS diff
+            GROUP BY vendor_id, day, status
+            HAVING SUM(order_count) <> 0 OR SUM(revenue) <> 0
+            ON CONFLICT (vendor_id, day, status) DO UPDATE SET
+                order_count = {rollup_table}.order_count + EXCLUDED.order_count,
+                revenue = {rollup_table}.revenue + EXCLUDED.revenue,
+                updated_at = EXCLUDED.updated_at
+            """,
+            [
+                settings.TIME_ZONE,
+                _day_start(date_from),
+                _day_start(date_to + timedelta(days=1)),
+                date_from,
+                date_to,
+            ],
+        )
+        corrected = cursor.rowcount
+    if corrected:
+        logger.warning("Corrected %s order rollup rows between %s and %s.", corrected, date_from, date_to)
+    return corrected
+
+
+def reconcile_recent_rollups(days=None):
+    days = days or settings.ORDER_ROLLUP_RECONCILE_DAYS
+    today = timezone.localdate()
+    return reconcile_rollups(today - timedelta(days=days - 1), today)
+
+
+def daily_report(queryset, date_from, date_to):
+    """
+    Per day order counts by status, order total and revenue, plus totals
+    for the range, read from rollup rows only: O(days x statuses).
+    """
+    rows = (
+        queryset.filter(day__gte=date_from, day__lte=date_to)
+        .values("day", "status")
+        .annotate(orders=Sum("order_count"), revenue=Sum("revenue"))
+        .order_by("day")
+    )
+    days = {}
+    totals = {"orders": 0, "revenue": Decimal("0.00"), "statuses": {}}
+    for row in rows:
+        if not row["orders"]:
+            continue
+        day = days.setdefault(row["day"], {"day": row["day"], "orders": 0, "revenue": Decimal("0.00"), "statuses": {}})
+        for bucket in (day, totals):
+            bucket["orders"] += row["orders"]
+            bucket["statuses"][row["status"]] = bucket["statuses"].get(row["status"], 0) + row["orders"]
+            if row["status"] in REVENUE_STATUSES:
+                bucket["revenue"] += row["revenue"]
+    for bucket in (*days.values(), totals):
+        bucket["revenue"] = decimal_str(bucket["revenue"])
+    return {"days": list(days.values()), "totals": totals}
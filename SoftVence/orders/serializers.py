@@ -4,6 +4,7 @@ from services.models import ServiceVariant
 from services.serializers import VendorRetrieveSerializer
 from .models import RepairOrder
 from accounts.models import User
+from common.projection import ProjectionSerializer, decimal_str, duration_str, datetime_str
 
 
 class CustomerUserSerializer(serializers.ModelSerializer):
@@ -23,4 +24,47 @@ class RepairOrderRetriveListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = RepairOrder
-        fields = ["id", "order_id", "status", "total_amount", "customer", "vendor", "variant"]
\ No newline at end of file
+        fields = ["id", "order_id", "status", "total_amount", "customer", "vendor", "variant", "created_at"]
+
+
+class RepairOrderListProjection(ProjectionSerializer):
+    """RepairOrderRetriveListSerializer's JSON built from values() rows."""
+    columns = (
+        "id", "order_id", "status", "total_amount", "created_at",
+        "customer_id", "customer__email", "customer__role",
+        "vendor_id", "vendor__business_name", "vendor__address", "vendor__is_active",
+        "vendor__user_id", "vendor__user__email", "vendor__user__role",
+        "variant_id", "variant__name", "variant__price", "variant__estimated_minutes", "variant__stock",
+    )
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "order_id": str(row["order_id"]),
+            "status": row["status"],
+            "total_amount": decimal_str(row["total_amount"]),
+            "customer": {
+                "id": row["customer_id"],
+                "email": row["customer__email"],
+                "role": row["customer__role"],
+            },
+            "vendor": {
+                "id": row["vendor_id"],
+                "user": {
+                    "id": row["vendor__user_id"],
+                    "email": row["vendor__user__email"],
+                    "role": row["vendor__user__role"],
+                },
+                "business_name": row["vendor__business_name"],
+                "address": row["vendor__address"],
+                "is_active": row["vendor__is_active"],
+            },
+            "variant": {
+                "id": row["variant_id"],
+                "name": row["variant__name"],
+                "price": decimal_str(row["variant__price"]),
+                "estimated_minutes": duration_str(row["variant__estimated_minutes"]),
+                "stock": row["variant__stock"],
+            },
+            "created_at": datetime_str(row["created_at"]),
+        }
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from orders.models import RepairOrder
+from .rollups import record_order_created
+
+
+@receiver(post_save, sender=RepairOrder)
+def add_order_to_rollups(sender, instance, created, **kwargs):
+    # status changes go through RepairOrder.objects.transition()
+    if created:
+        record_order_created(instance)
@@ -1,3 +1,193 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import skipUnless
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from accounts.models import User
+from orders.models import RepairOrder, StockReservation
+from orders.processing import complete_stale_processing
+from orders.reservations import commit_reservation, release_expired_reservations, reserve_stock
+from orders.views import CustomerOrderHistoryView, VendorOrderHistoryView
+from payments.models import Payment
+from services.models import Service, ServiceVariant
+from vendors.models import Vendor
 
-# Create your tests here.
+
+@skipUnless(connection.vendor == "postgresql", "query plans are checked on PostgreSQL")
+class OrderQueryPlanTests(TestCase):
+    """
+    EXPLAIN the order, reservation and payment queries the views, sweeps
+    and webhook actually run, over a seeded and ANALYZEd order book: many
+    customers and vendors, mostly completed orders, a few pending ones
+    holding stock. Each query must use its own index and no sequential scan.
+    """
+
+    STATUSES = ["completed"] * 80 + ["cancelled"] * 8 + ["paid"] * 5 + ["pending"] * 4 + ["processing"] * 2 + ["failed"]
+
+    @classmethod
+    def setUpTestData(cls):
+        customers = User.objects.bulk_create(
+            [User(email=f"customer{i}@example.com", role="customer") for i in range(200)]
+        )
+        vendor_users = User.objects.bulk_create(
+            [User(email=f"vendor{i}@example.com", role="vendor") for i in range(40)]
+        )
+        vendors = Vendor.objects.bulk_create(
+            [Vendor(user=user, business_name=f"Vendor {i}", address="-") for i, user in enumerate(vendor_users)]
+        )
+        services = Service.objects.bulk_create(
+            [Service(vendor=vendor, name="Screen repair", is_approved=True) for vendor in vendors]
+        )
+        variants = ServiceVariant.objects.bulk_create([
+            ServiceVariant(
+                service=service, name="Standard", price=Decimal("500.00"),
+                estimated_minutes=timedelta(minutes=30), stock=100,
+            )
+            for service in services
+        ])
+        orders = RepairOrder.objects.bulk_create(
+            [
+                RepairOrder(
+                    customer=customers[i % len(customers)],
+                    vendor=vendors[i // 7 % len(vendors)],
+                    variant=variants[i // 7 % len(vendors)],
+                    total_amount=Decimal("500.00"),
+                    status=cls.STATUSES[i % len(cls.STATUSES)],
+                )
+                for i in range(50000)
+            ],
+            batch_size=5000,
+        )
+        expires_at = timezone.now() + timedelta(minutes=15)
+        StockReservation.objects.bulk_create(
+            [
+                StockReservation(
+                    order=order,
+                    variant_id=order.variant_id,
+                    status={"pending": "held", "failed": "released", "cancelled": "released"}.get(order.status, "committed"),
+                    expires_at=expires_at,
+                )
+                for order in orders
+            ],
+            batch_size=5000,
+        )
+        Payment.objects.bulk_create(
+            [
+                Payment(order=order, intent_id=f"cs_test_{order.id}", amount=order.total_amount)
+                for order in orders
+                if order.status != "pending"
+            ],
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            # spread the orders over a year, one every ten minutes
+            cursor.execute("UPDATE orders_repairorder SET created_at = now() - id * interval '10 minutes'")
+            cursor.execute("ANALYZE")
+        cls.customer = customers[0]
+        cls.vendor_user = vendor_users[0]
+        # the JWT claims user carries vendor_id
+        cls.vendor_user.vendor_id = vendors[0].id
+        cls.order = orders[len(orders) // 2]
+
+    def history_page(self, view_class, user, **params):
+        view = view_class()
+        view.request = Request(APIRequestFactory().get("/", params))
+        view.request.user = user
+        queryset = view.get_queryset()
+        ordering = view.paginator.get_ordering(view.request, queryset, view)
+        return queryset.order_by(*ordering)[: view.paginator.page_size + 1]
+
+    def explain_first_query(self, fn):
+        with CaptureQueriesContext(connection) as queries:
+            fn()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN " + queries[0]["sql"])
+            return "\n".join(row[0] for row in cursor.fetchall())
+
+    def assertUsesIndex(self, plan, index_name, table):
+        if not isinstance(plan, str):
+            plan = plan.explain()
+        self.assertIn(index_name, plan, plan)
+        self.assertNotIn(f"Seq Scan on {table}", plan, plan)
+
+    def test_customer_history_uses_created_index(self):
+        queryset = self.history_page(CustomerOrderHistoryView, self.customer)
+        self.assertUsesIndex(queryset, "order_customer_created_idx", "orders_repairorder")
+
+    def test_customer_history_by_status_uses_status_index(self):
+        queryset = self.history_page(CustomerOrderHistoryView, self.customer, status="paid")
+        self.assertUsesIndex(queryset, "order_customer_status_idx", "orders_repairorder")
+
+    def test_vendor_history_uses_created_index(self):
+        queryset = self.history_page(VendorOrderHistoryView, self.vendor_user)
+        self.assertUsesIndex(queryset, "order_vendor_created_idx", "orders_repairorder")
+
+    def test_vendor_history_by_status_uses_status_index(self):
+        queryset = self.history_page(VendorOrderHistoryView, self.vendor_user, status="pending")
+        self.assertUsesIndex(queryset, "order_vendor_status_idx", "orders_repairorder")
+
+    def test_webhook_order_lookup_uses_order_id_key(self):
+        queryset = RepairOrder.objects.filter(order_id=self.order.order_id).only("id", "total_amount", "status")
+        self.assertUsesIndex(queryset, "orders_repairorder_order_id_key", "orders_repairorder")
+
+    def test_webhook_payment_lookup_uses_intent_id_index(self):
+        queryset = Payment.objects.filter(intent_id=f"cs_test_{self.order.id}").values("id")
+        self.assertUsesIndex(queryset, "payment_intent_id_uniq", "payments_payment")
+
+    def test_expired_reservation_sweep_uses_held_index(self):
+        plan = self.explain_first_query(release_expired_reservations)
+        self.assertUsesIndex(plan, "reservation_held_expiry_idx", "orders_stockreservation")
+
+    def test_stale_processing_sweep_uses_processing_index(self):
+        plan = self.explain_first_query(complete_stale_processing)
+        self.assertUsesIndex(plan, "order_processing_idx", "orders_repairorder")
+
+
+class OrderStockReleaseTests(TestCase):
+    """Failed and cancelled orders give their reserved stock back."""
+
+    def setUp(self):
+        customer = User.objects.create_user(email="customer@example.com", password=None, role="customer")
+        vendor_user = User.objects.create_user(email="vendor@example.com", password=None, role="vendor")
+        vendor = Vendor.objects.create(user=vendor_user, business_name="Fixers", address="Dhaka")
+        service = Service.objects.create(vendor=vendor, name="Screen repair", is_approved=True)
+        self.variant = ServiceVariant.objects.create(
+            service=service, name="Standard", price=Decimal("500.00"),
+            estimated_minutes=timedelta(minutes=30), stock=5,
+        )
+        self.order = RepairOrder.objects.create(
+            customer=customer, vendor=vendor, variant=self.variant, total_amount=self.variant.price,
+        )
+        reserve_stock(self.order)
+
+    def assertStockReleased(self):
+        self.variant.refresh_from_db()
+        self.assertEqual(self.variant.stock, 5)
+        self.assertEqual(StockReservation.objects.get(order=self.order).status, "released")
+
+    def test_cancelled_order_releases_stock(self):
+        self.assertTrue(RepairOrder.objects.transition(self.order.id, "pending", "cancelled"))
+        self.assertStockReleased()
+
+    def test_failed_processing_releases_committed_stock(self):
+        RepairOrder.objects.transition(self.order.id, "pending", "paid")
+        commit_reservation(self.order.id)
+        RepairOrder.objects.transition(self.order.id, "paid", "processing")
+        self.assertTrue(RepairOrder.objects.transition(self.order.id, "processing", "failed"))
+        self.assertStockReleased()
+
+    def test_expired_order_is_failed_and_released_together(self):
+        StockReservation.objects.filter(order=self.order).update(expires_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(release_expired_reservations(), 1)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "failed")
+        self.assertStockReleased()
+
+    def test_release_is_not_repeated(self):
+        RepairOrder.objects.transition(self.order.id, "pending", "cancelled")
+        self.assertFalse(RepairOrder.objects.transition(self.order.id, "pending", "cancelled"))
+        self.assertStockReleased()
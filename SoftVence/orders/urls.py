@@ -4,5 +4,10 @@ from . import views as view
 app_name = "orders"
 
 urlpatterns = [
-    path("create/", view.CreateOrderAPIView.as_view(), name="create-order")
+    path("create/", view.CreateOrderAPIView.as_view(), name="create-order"),
+    path("<uuid:order_id>/checkout/", view.OrderCheckoutStatusAPIView.as_view(), name="order-checkout-status"),
+    path("export/", view.OrderExportAPIView.as_view(), name="order-export"),
+    path("rollups/", view.OrderRollupAPIView.as_view(), name="order-rollups"),
+    path("history/", view.CustomerOrderHistoryView.as_view(), name="customer-order-history"),
+    path("vendor/history/", view.VendorOrderHistoryView.as_view(), name="vendor-order-history"),
 ]
\ No newline at end of file
@@ -1,16 +1,28 @@
-import stripe
-from orders.models import RepairOrder
-from orders.serializers import RepairOrderRetriveListSerializer
-from payments.models import PaymentEvent, Payment
+from orders.models import RepairOrder, VendorDailyRollup
+from orders.rollups import daily_report
+from orders.serializers import RepairOrderRetriveListSerializer, RepairOrderListProjection
+from orders.reservations import reserve_stock
+from payments.checkout import create_checkout_session
+from payments.celery.task import build_checkout_session
+from payments.stripe_client import StripeGateway, StripeUnavailable
 from rest_framework import status
-from common import Response, ValidationError
+from common import Response, ValidationError, CursorPagination
+from common.export import streaming_export
+from common.filters import list_filters, parse_date_param
+from django.utils import timezone
+from datetime import timedelta
+from common.renderers import ORJSONRenderer
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.exceptions import PermissionDenied
 from services.models import ServiceVariant
 from vendors.models import Vendor
 from rest_framework.views import APIView
+from rest_framework import generics
 from drf_spectacular.utils import inline_serializer, extend_schema
 from rest_framework import serializers as drf_serializers
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.conf import settings
+from django.db import transaction
 
 
 class CreateOrderAPIView(APIView):
@@ -19,7 +31,7 @@ class CreateOrderAPIView(APIView):
     def _get_valid_vendor(self, vendor_id):
         if not vendor_id:
             raise ValidationError("Vendor ID is required")
-        vendor = Vendor.objects.get(id=vendor_id)
+        vendor = Vendor.objects.filter(id=vendor_id).first()
         if not vendor:
             raise ValidationError("Vendor does not exist")
         
@@ -28,14 +40,27 @@ class CreateOrderAPIView(APIView):
     def _get_valid_service_variant(self, vendor, variant_id):
         if not variant_id:
             raise ValidationError("Service Variant ID is required")
-        variant = ServiceVariant.objects.get(id=variant_id, service__vendor=vendor)
+        variant = ServiceVariant.objects.filter(id=variant_id, service__vendor=vendor).first()
         if not variant:
             raise ValidationError("Service Variant does not exist for the given vendor")
         return variant
 
+    def _is_async_checkout(self, request):
+        value = request.data.get("async_checkout")
+        if value is None:
+            return settings.ORDER_ASYNC_CHECKOUT
+        try:
+            return drf_serializers.BooleanField().to_internal_value(value)
+        except drf_serializers.ValidationError:
+            raise ValidationError("async_checkout must be a boolean")
+
     @extend_schema(
         summary="Create Repair Order",
-        description="Customer creates a repair order for a service variant provided by a vendor.",
+        description=(
+            "Customer creates a repair order for a service variant provided by a vendor. "
+            "With async_checkout the order is accepted with 202 and the checkout url is "
+            "served by the order checkout status endpoint once ready."
+        ),
         request=inline_serializer(
             name="CreateOrderSerializer",
             fields={
@@ -45,10 +70,20 @@ class CreateOrderAPIView(APIView):
                 "variant_id": drf_serializers.IntegerField(
                     required=True,
                 ),
+                "async_checkout": drf_serializers.BooleanField(
+                    required=False,
+                ),
             },
         ),
         responses={
             201: RepairOrderRetriveListSerializer,
+            202: inline_serializer(
+                name="CreateOrderAcceptedResponse",
+                fields={
+                    "order_id": drf_serializers.UUIDField(),
+                    "status": drf_serializers.CharField(),
+                },
+            ),
             400: ValidationError,
         },
     )
@@ -61,59 +96,47 @@ class CreateOrderAPIView(APIView):
             
             vendor_id =  request.data.get("vendor_id")
             variant_id = request.data.get("variant_id")
+            async_checkout = self._is_async_checkout(request)
             vendor = self._get_valid_vendor(vendor_id)
             variant = self._get_valid_service_variant(vendor, variant_id)
 
-            order = RepairOrder.objects.create(
-                customer=request.user,
-                vendor=vendor,
-                variant=variant,
-                total_amount=variant.price,
-                status="pending"
-            )
-            if order.total_amount < MIN_STRIPE_BDT:
+            if variant.price < MIN_STRIPE_BDT:
                 raise ValidationError(
                     f"Minimum payment amount is ৳{MIN_STRIPE_BDT} for online payment."
                 )
-                
-            # ======= Payment Intent for mobile app =======
-            # intent = stripe.PaymentIntent.create(
-            #     amount=int(order.total_amount * 100), # paisa
-            #     currency="bdt",
-            #     metadata={
-            #         "order_id": str(order.order_id),
-            #     },
-            # )
-            
-            # ======= checkout  session for web =======
-            session = stripe.checkout.Session.create(
-                payment_method_types=["card"],
-                mode="payment",
-                line_items=[
-                    {
-                        "price_data": {
-                            "currency": "bdt",
-                            "unit_amount": int(order.total_amount * 100),  # paisa
-                            "product_data": {
-                                "name": f"{variant.name} - {vendor.business_name}",
-                            },
-                        },
-                        "quantity": 1,
-                    }
-                ],
-                metadata={
-                    "order_id": str(order.order_id),
-                },
-                success_url=f"{settings.DOMAIN}/payment/success?order_id=" + str(order.order_id),
-                cancel_url=f"{settings.DOMAIN}/payment/cancel?order_id=" + str(order.order_id),
-            )
 
-            Payment.objects.create(
-                order=order,
-                intent_id=session.id,
-                amount=order.total_amount,
-                status="pending",
-            )
+            with transaction.atomic():
+                order = RepairOrder.objects.create(
+                    customer=request.user,
+                    vendor=vendor,
+                    variant=variant,
+                    total_amount=variant.price,
+                    status="pending"
+                )
+                reserve_stock(order)
+
+            if async_checkout:
+                build_checkout_session.delay(order.id)
+                data = {
+                    "order_id": order.order_id,
+                    "status": order.status,
+                }
+                return Response(
+                    message="Order accepted, checkout is being prepared",
+                    data=data,
+                    status_code=status.HTTP_202_ACCEPTED,
+                )
+
+            try:
+                session = create_checkout_session(order)
+            except (StripeUnavailable, *StripeGateway.RETRYABLE_ERRORS):
+                # also releases the reservation
+                RepairOrder.objects.transition(order.id, "pending", "failed")
+                return Response(
+                    success=False,
+                    message="Payment provider is unavailable, please try again shortly.",
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
 
             data = {
                 "order_id": order.order_id,
@@ -126,4 +149,180 @@ class CreateOrderAPIView(APIView):
                 success=False,
                 message=e.detail["message"],
                 status_code=e.detail["status_code"],
-            )
\ No newline at end of file
+            )
+
+
+class OrderCheckoutStatusAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Order checkout status",
+        description="Customer polls the order status and the Stripe checkout url of their order.",
+        responses={
+            200: inline_serializer(
+                name="OrderCheckoutStatusResponse",
+                fields={
+                    "order_id": drf_serializers.UUIDField(),
+                    "status": drf_serializers.CharField(),
+                    "checkout_url": drf_serializers.URLField(allow_null=True),
+                },
+            ),
+        },
+    )
+    def get(self, request, order_id):
+        order = (
+            RepairOrder.objects.filter(order_id=order_id, customer=request.user)
+            .values("order_id", "status", "payment_order__checkout_url")
+            .first()
+        )
+        if not order:
+            return Response(success=False, message="Order not found", status_code=status.HTTP_404_NOT_FOUND)
+
+        data = {
+            "order_id": order["order_id"],
+            "status": order["status"],
+            "checkout_url": order["payment_order__checkout_url"],
+        }
+        return Response(data=data, status_code=status.HTTP_200_OK)
+
+
+class OrderExportAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+    EXPORT_FIELDS = (
+        "order_id", "status", "total_amount", "created_at", "updated_at",
+        "customer__email", "vendor_id", "vendor__business_name",
+        "variant__name", "variant__service__name",
+    )
+
+    @extend_schema(
+        summary="Export orders",
+        description=(
+            "Streams orders as CSV or JSON lines. Query params: export_format (csv|jsonl), "
+            "status, date_from, date_to (YYYY-MM-DD) and vendor (admin only). "
+            "Vendors only get their own orders."
+        ),
+        responses={200: None},
+    )
+    def get(self, request):
+        user = request.user
+        if user.role not in ["vendor", "admin"]:
+            raise PermissionDenied("Only vendors and admin can export orders")
+
+        try:
+            filters = list_filters(request, RepairOrder.STATUS)
+            queryset = RepairOrder.objects.filter(**filters).order_by("id")
+            if user.role == "vendor":
+                queryset = queryset.filter(vendor__user=user)
+            return streaming_export(queryset, self.EXPORT_FIELDS, "orders", request.query_params.get("export_format", "csv"))
+        except ValidationError as e:
+            return Response(
+                success=False,
+                message=e.detail["message"],
+                status_code=e.detail["status_code"],
+            )
+
+
+class OrderHistoryPagination(CursorPagination):
+    """
+    Cursor pagination, newest first. DRF encodes the cursor as a created_at
+    position plus an offset over rows sharing that timestamp, with id only
+    keeping the order stable, so each page is an index range scan on the
+    owner's (customer|vendor, created_at, id) index.
+    """
+    ordering = ("-created_at", "-id")
+
+
+class OrderHistoryListView(generics.ListAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = RepairOrderListProjection
+    pagination_class = OrderHistoryPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    role = None
+    owner_field = None
+    # whether ?vendor= narrows the list
+    vendor_filter = True
+
+    def get_owner_filter(self, user):
+        return {self.owner_field: user.id}
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role != self.role:
+            raise PermissionDenied(f"Only {self.role}s can view this order history")
+
+        filters = list_filters(self.request, RepairOrder.STATUS)
+        if not self.vendor_filter:
+            filters.pop("vendor_id", None)
+        # the owner filter always wins over query params
+        filters.update(self.get_owner_filter(user))
+        # one joined values() projection, no model instances
+        return RepairOrder.objects.filter(**filters).values(*RepairOrderListProjection.columns)
+
+
+@extend_schema(
+    summary="Customer order history",
+    responses=RepairOrderRetriveListSerializer,
+    description="Query params: status, date_from, date_to (YYYY-MM-DD), vendor, cursor, page_size.",
+)
+class CustomerOrderHistoryView(OrderHistoryListView):
+    role = "customer"
+    owner_field = "customer_id"
+
+
+@extend_schema(
+    summary="Vendor order history",
+    responses=RepairOrderRetriveListSerializer,
+    description="Query params: status, date_from, date_to (YYYY-MM-DD), cursor, page_size.",
+)
+class VendorOrderHistoryView(OrderHistoryListView):
+    role = "vendor"
+    vendor_filter = False
+
+    def get_owner_filter(self, user):
+        # the JWT claims user carries vendor_id, which skips the vendor join
+        vendor_id = getattr(user, "vendor_id", None)
+        if vendor_id is not None:
+            return {"vendor_id": vendor_id}
+        return {"vendor__user": user}
+
+
+class OrderRollupAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+    MAX_DAYS = 366
+
+    @extend_schema(
+        summary="Order and revenue dashboard",
+        description=(
+            "Per day order counts by status, orders and revenue (paid, processing and completed "
+            "orders) plus range totals, read from the vendor daily rollups. Query params: "
+            "date_from, date_to (YYYY-MM-DD, default last 30 days) and vendor (admin only). "
+            "Vendors only get their own numbers."
+        ),
+        responses={200: None},
+    )
+    def get(self, request):
+        user = request.user
+        if user.role not in ["vendor", "admin"]:
+            raise PermissionDenied("Only vendors and admin can view order dashboards")
+
+        date_to = parse_date_param(request, "date_to", timezone.localdate())
+        date_from = parse_date_param(request, "date_from", date_to - timedelta(days=29))
+        if date_from > date_to:
+            raise ValidationError("date_from must be before date_to")
+        if (date_to - date_from).days >= self.MAX_DAYS:
+            raise ValidationError(f"The range can cover at most {self.MAX_DAYS} days")
+
+        queryset = VendorDailyRollup.objects.all()
+        if user.role == "vendor":
+            vendor_id = getattr(user, "vendor_id", None)
+            if vendor_id is not None:
+                queryset = queryset.filter(vendor_id=vendor_id)
+            else:
+                queryset = queryset.filter(vendor__user=user)
+        elif request.query_params.get("vendor"):
+            vendor = request.query_params["vendor"]
+            if not vendor.isdigit():
+                raise ValidationError("vendor must be an id")
+            queryset = queryset.filter(vendor_id=int(vendor))
+
+        return Response(data=daily_report(queryset, date_from, date_to), status_code=status.HTTP_200_OK)
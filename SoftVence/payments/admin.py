@@ -1,13 +1,18 @@
 from django.contrib import admin
-from .models import Payment, PaymentEvent
+from .models import Payment, PaymentEvent, Invoice
 
 class PaymentAdmin(admin.ModelAdmin):
     list_display = ["id", "order", "intent_id", "status"]
     ordering = ["-id"]
 
 class PaymentEventAdmin(admin.ModelAdmin):
-    list_display = ["id", "payment", "event_id", "processed"]
+    list_display = ["id", "payment", "event_id", "event_type", "processed", "failed", "attempts"]
+    ordering = ["-id"]
+    
+class InvoiceAdmin(admin.ModelAdmin):
+    list_display = ["id", "number", "order", "status", "sent_at"]
     ordering = ["-id"]
     
 admin.site.register(Payment, PaymentAdmin)
 admin.site.register(PaymentEvent, PaymentEventAdmin)
+admin.site.register(Invoice, InvoiceAdmin)
@@ -1,24 +1,82 @@
 import logging
-import time
 from celery import shared_task
+from django.conf import settings
+from django.db import transaction
 from orders.models import RepairOrder
+from orders.processing import complete_stale_processing
+from orders.reservations import release_expired_reservations
+from orders.rollups import reconcile_recent_rollups
+from payments.models import Payment
+from payments.checkout import create_checkout_session
+from payments.events import process_pending_events
+from payments.invoices import queue_invoice, deliver_pending_invoices
 
 logger = logging.getLogger(__name__)
 
+CHECKOUT_MAX_RETRIES = 3
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_kwargs={"max_retries": CHECKOUT_MAX_RETRIES})
+def build_checkout_session(self, order_id):
+    order = RepairOrder.objects.select_related("vendor", "variant").get(id=order_id)
+    if order.status != "pending" or Payment.objects.filter(order=order).exists():
+        return True
+
+    try:
+        create_checkout_session(order)
+    except Exception:
+        if self.request.retries >= CHECKOUT_MAX_RETRIES:
+            # also releases the reservation
+            RepairOrder.objects.transition(order.id, "pending", "failed")
+            logger.error("Checkout session for order %s could not be created.", order.order_id)
+        raise
+
+    logger.info("Checkout session ready for order %s.", order.order_id)
+    return True
+
 @shared_task(bind=True, autoretry_for=(Exception,), retry_kwargs={"max_retries": 3})
 def send_invoice(self, order_id):
-    pass
+    # rendering and delivery happen in batches in deliver_invoices
+    queue_invoice(order_id)
+    return True
+
+@shared_task
+def deliver_invoices():
+    return deliver_pending_invoices()
 
 @shared_task(bind=True, autoretry_for=(Exception,), retry_kwargs={"max_retries": 3})
 def start_processing(self, order_id):
-    order = RepairOrder.objects.get(id=order_id)
-    order.status = "processing"
-    order.save()
-    logger.info("Order %s is now processing.", order.order_id)
-    time.sleep(30)  # watching some processing time
-    
-    order.status = "completed"
-    order.save()
-    logger.info("Order %s is now completed.", order.order_id)
-    
-    return True
\ No newline at end of file
+    with transaction.atomic():
+        # duplicate enqueues (webhook retries) find the order already moved on
+        if not RepairOrder.objects.transition(order_id, "paid", "processing"):
+            logger.info("Order %s is not paid, skipping processing.", order_id)
+            return False
+
+        # watching some processing time, scheduled instead of sleeping in the worker.
+        # Enqueued before the commit: if the broker is down the order stays paid
+        # and the retry starts over instead of leaving it stuck in processing.
+        complete_processing.apply_async((order_id,), countdown=settings.ORDER_PROCESSING_SECONDS)
+    logger.info("Order %s is now processing.", order_id)
+    return True
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_kwargs={"max_retries": 3})
+def complete_processing(self, order_id):
+    if not RepairOrder.objects.transition(order_id, "processing", "completed"):
+        return False
+    logger.info("Order %s is now completed.", order_id)
+    return True
+
+@shared_task
+def complete_stale_orders():
+    return complete_stale_processing()
+
+@shared_task
+def release_expired_stock_reservations():
+    return release_expired_reservations()
+
+@shared_task
+def reconcile_order_rollups():
+    return reconcile_recent_rollups()
+
+@shared_task
+def process_payment_events():
+    return process_pending_events()
@@ -0,0 +1,70 @@
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from orders.models import StockReservation
+from payments.models import Payment
+from payments.stripe_client import get_stripe_client
+
+
+def create_checkout_session(order):
+    """
+    Create the Stripe Checkout Session for a pending order and store the
+    matching pending Payment. Uses the order id as idempotency key so a
+    retried call never opens a second session.
+    """
+    # ======= Payment Intent for mobile app =======
+    # intent = stripe.PaymentIntent.create(
+    #     amount=int(order.total_amount * 100), # paisa
+    #     currency="bdt",
+    #     metadata={
+    #         "order_id": str(order.order_id),
+    #     },
+    # )
+
+    # ======= checkout  session for web =======
+    params = {
+        "payment_method_types": ["card"],
+        "mode": "payment",
+        "line_items": [
+            {
+                "price_data": {
+                    "currency": "bdt",
+                    "unit_amount": int(order.total_amount * 100),  # paisa
+                    "product_data": {
+                        "name": f"{order.variant.name} - {order.vendor.business_name}",
+                    },
+                },
+                "quantity": 1,
+            }
+        ],
+        "metadata": {
+            "order_id": str(order.order_id),
+        },
+        "success_url": f"{settings.DOMAIN}/payment/success?order_id=" + str(order.order_id),
+        "cancel_url": f"{settings.DOMAIN}/payment/cancel?order_id=" + str(order.order_id),
+    }
+
+    # close the checkout together with the stock reservation. Stripe needs the
+    # session open for >= 30 minutes, so a reservation nearer its end (async
+    # checkout picked up late) is extended rather than outlived by the session.
+    reservation = StockReservation.objects.filter(order=order, status="held").only("id", "expires_at").first()
+    if reservation:
+        min_expires_at = timezone.now() + timedelta(minutes=31)
+        if reservation.expires_at < min_expires_at:
+            reservation.expires_at = min_expires_at
+            reservation.save(update_fields=["expires_at", "updated_at"])
+        params["expires_at"] = int(reservation.expires_at.timestamp())
+
+    session = get_stripe_client().create_checkout_session(
+        params,
+        idempotency_key=f"checkout-{order.order_id}",
+    )
+
+    Payment.objects.create(
+        order=order,
+        intent_id=session.id,
+        amount=order.total_amount,
+        status="pending",
+        checkout_url=session.url,
+    )
+    return session
@@ -0,0 +1,119 @@
+import logging
+from decimal import Decimal
+from django.db import connection, transaction
+from django.utils import timezone
+from orders.models import RepairOrder
+from orders.reservations import commit_reservation
+from payments.invoices import queue_invoice
+from payments.models import Payment, PaymentEvent
+
+logger = logging.getLogger(__name__)
+
+PAID_EVENT_TYPES = ("payment_intent.succeeded", "checkout.session.completed")
+EVENT_MAX_ATTEMPTS = 5
+
+
+def record_event(event_id, event_type, object_id, payload):
+    """
+    Store a verified Stripe event in one round trip.
+
+    A single `INSERT ... ON CONFLICT DO NOTHING` links the Payment by its
+    intent/session id in a sub-select. Returns False when the event was
+    already stored (a Stripe retry).
+    """
+    event_table = PaymentEvent._meta.db_table
+    payment_table = Payment._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {event_table} (event_id, event_type, payload, payment_id, processed, failed, attempts, created_at, updated_at)
+            VALUES (%s, %s, %s::jsonb, (SELECT id FROM {payment_table} WHERE intent_id = %s), false, false, 0, now(), now())
+            ON CONFLICT (event_id) DO NOTHING
+            """,
+            [event_id, event_type, payload, object_id],
+        )
+        return cursor.rowcount == 1
+
+
+def _handle_paid(event):
+    # Handle the event for mobile app checkout (payment_intent.succeeded)
+    # and web checkout (checkout.session.completed)
+    obj = event.payload["data"]["object"]
+    # payment intents created by Checkout carry no metadata of their own;
+    # those orders are handled by the checkout.session.completed event
+    order_id = (obj.get("metadata") or {}).get("order_id")
+    if not order_id:
+        logger.info("Event %s has no order id; ignored.", event.event_id)
+        return
+    if event.event_type == "payment_intent.succeeded":
+        amount = Decimal(obj["amount_received"]) / 100
+    else:
+        amount = Decimal(obj["amount_total"]) / 100
+
+    order = RepairOrder.objects.filter(order_id=order_id).only("id", "total_amount", "status").first()
+    if not order:
+        logger.error("Event %s references unknown order %s.", event.event_id, order_id)
+        return
+    if order.total_amount != amount:
+        logger.error("Event %s amount mismatch for order %s.", event.event_id, order_id)
+        return
+
+    # conditional so a second paid event for the same order is a no-op
+    if not RepairOrder.objects.transition(order.id, "pending", "paid"):
+        if order.status != "paid":
+            logger.error("Order %s paid while %s; needs manual review.", order_id, order.status)
+        return
+
+    commit_reservation(order.id)
+    Payment.objects.filter(order_id=order.id).update(status="succeeded", raw_response=obj, updated_at=timezone.now())
+
+    queue_invoice(order.id)
+    from payments.celery.task import start_processing
+    transaction.on_commit(lambda: start_processing.delay(order.id))
+    logger.info("Order %s marked as paid and processing started.", order_id)
+
+
+def process_pending_events(batch_size=100):
+    """
+    Apply unprocessed PaymentEvents in id order, one batch per transaction.
+
+    Rows are claimed with SKIP LOCKED so parallel drains never pick the same
+    event. An event that raises is retried on the next run and marked failed
+    after EVENT_MAX_ATTEMPTS tries.
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            events = list(
+                PaymentEvent.objects.select_for_update(skip_locked=True)
+                .filter(processed=False, failed=False, id__gt=last_id)
+                .order_by("id")[:batch_size]
+            )
+            if not events:
+                break
+
+            done, retry = [], []
+            now = timezone.now()
+            for event in events:
+                try:
+                    with transaction.atomic():
+                        if event.event_type in PAID_EVENT_TYPES:
+                            _handle_paid(event)
+                    done.append(event.id)
+                except Exception:
+                    logger.exception("Failed to process payment event %s.", event.event_id)
+                    event.attempts += 1
+                    event.failed = event.attempts >= EVENT_MAX_ATTEMPTS
+                    event.updated_at = now
+                    retry.append(event)
+
+            PaymentEvent.objects.filter(id__in=done).update(processed=True, updated_at=now)
+            if retry:
+                PaymentEvent.objects.bulk_update(retry, ["attempts", "failed", "updated_at"])
+            processed += len(done)
+            last_id = events[-1].id
+
+        if len(events) < batch_size:
+            break
+    return processed
@@ -0,0 +1,123 @@
+import logging
+import time
+from contextlib import suppress
+from functools import lru_cache
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.template.loader import get_template
+from django.utils import timezone
+from payments.models import Invoice
+
+logger = logging.getLogger(__name__)
+
+INVOICE_TEMPLATE = "payments/invoice.html"
+INVOICE_MAX_ATTEMPTS = 3
+DELIVERY_SCHEDULED_KEY = "invoices:delivery-scheduled"
+
+
+@lru_cache(maxsize=1)
+def _template():
+    # compiled once per worker process
+    return get_template(INVOICE_TEMPLATE)
+
+
+def queue_invoice(order_id):
+    """
+    Record a pending invoice for a paid order and make sure a batch
+    delivery is scheduled. Repeated calls for the same order are no-ops.
+    """
+    Invoice.objects.bulk_create(
+        [Invoice(order_id=order_id, number=f"INV-{order_id:08d}")],
+        ignore_conflicts=True,
+    )
+    schedule_delivery()
+
+
+def schedule_delivery():
+    # one delayed batch per window instead of one task per invoice
+    window = settings.INVOICE_BATCH_WINDOW
+    if cache.add(DELIVERY_SCHEDULED_KEY, 1, timeout=window):
+        from payments.celery.task import deliver_invoices
+        transaction.on_commit(lambda: deliver_invoices.apply_async(countdown=window))
+
+
+def render_invoice(invoice):
+    html = _template().render({"invoice": invoice, "order": invoice.order})
+    if invoice.file:
+        invoice.file.delete(save=False)  # left over from a failed send
+    invoice.file.save(f"{invoice.order.order_id}.html", ContentFile(html.encode("utf-8")), save=False)
+    return html
+
+
+def _build_message(invoice, html, connection):
+    message = EmailMessage(
+        subject=f"Your MarketLink invoice {invoice.number}",
+        body=f"Thank you for your order {invoice.order.order_id}. Your invoice is attached.",
+        to=[invoice.order.customer.email],
+        connection=connection,
+    )
+    message.attach(f"{invoice.number}.html", html, "text/html")
+    return message
+
+
+def deliver_pending_invoices(batch_size=None):
+    """
+    Render and send pending invoices in batches over a single mail
+    connection. Messages go out one by one, so a rejected message only
+    counts against its own invoice. Returns the number of invoices sent.
+    """
+    if not Invoice.objects.filter(status="pending").exists():
+        return 0
+
+    batch_size = batch_size or settings.INVOICE_BATCH_SIZE
+    started = time.monotonic()
+    sent = 0
+    connection = get_connection()
+    connection.open()
+    try:
+        while True:
+            with transaction.atomic():
+                invoices = list(
+                    Invoice.objects.select_for_update(skip_locked=True, of=("self",))
+                    .filter(status="pending")
+                    .select_related("order__customer", "order__vendor", "order__variant__service")
+                    .order_by("id")[:batch_size]
+                )
+                if not invoices:
+                    break
+
+                now = timezone.now()
+                for invoice in invoices:
+                    message = _build_message(invoice, render_invoice(invoice), connection)
+                    try:
+                        delivered = connection.send_messages([message]) == 1
+                    except Exception:
+                        logger.exception("Invoice %s failed to send.", invoice.number)
+                        delivered = False
+                        # drop a possibly broken connection; the backend reopens it on the next send
+                        with suppress(Exception):
+                            connection.close()
+
+                    invoice.updated_at = now
+                    if delivered:
+                        invoice.status = "sent"
+                        invoice.sent_at = now
+                        sent += 1
+                    else:
+                        invoice.attempts += 1
+                        if invoice.attempts >= INVOICE_MAX_ATTEMPTS:
+                            invoice.status = "failed"
+                Invoice.objects.bulk_update(invoices, ["file", "status", "attempts", "sent_at", "updated_at"])
+
+            if len(invoices) < batch_size:
+                break
+    finally:
+        connection.close()
+
+    if sent:
+        elapsed = time.monotonic() - started
+        logger.info("Delivered %s invoices in %.2fs (%.1f/s).", sent, elapsed, sent / elapsed if elapsed else sent)
+    return sent
@@ -12,12 +12,17 @@ class Payment(models.Model):
     intent_id = models.CharField(max_length=255)
     amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
     status = models.CharField(max_length=255, choices=CHOICESS, default="pending")
+    checkout_url = models.URLField(max_length=2048, null=True, blank=True)
     raw_response = models.JSONField(null=True, blank=True) 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ["-id"]
+        constraints = [
+            # webhook lookups by checkout session / payment intent id
+            models.UniqueConstraint(fields=["intent_id"], name="payment_intent_id_uniq"),
+        ]
     
     def __str__(self):
         return f"{self.order.order_id} - {self.status}"
@@ -31,10 +36,51 @@ class PaymentEvent(models.Model):
         related_name="payment_events"
     )
     event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=255, blank=True, default="")
+    payload = models.JSONField(null=True, blank=True)
     processed = models.BooleanField(default=False)
+    # set once processing has raised EVENT_MAX_ATTEMPTS times
+    failed = models.BooleanField(default=False)
+    attempts = models.PositiveSmallIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # process_payment_events drain
+            models.Index(
+                fields=["id"],
+                condition=models.Q(processed=False, failed=False),
+                name="payment_event_unprocessed_idx",
+            ),
+        ]
     
     def __str__(self):
         return f"Event ID: {self.event_id}"
 
+
+
+class Invoice(models.Model):
+    STATUS = (
+        ("pending", "Pending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    )
+    order = models.OneToOneField(RepairOrder, on_delete=models.CASCADE, related_name="invoice")
+    number = models.CharField(max_length=32, unique=True)
+    file = models.FileField(upload_to="invoices/", null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            # deliver_invoices drain
+            models.Index(fields=["id"], condition=models.Q(status="pending"), name="invoice_pending_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.number} - {self.status}"
@@ -0,0 +1,167 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+import stripe
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class StripeUnavailable(Exception):
+    """
+    Raised without calling Stripe while the circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker shared by every Stripe call in the process.
+
+    Opens once `failure_rate` of the calls in the last `window_seconds`
+    failed (with at least `min_calls` calls seen), rejects calls for
+    `reset_timeout` seconds, then lets a single trial call through
+    (half-open) to decide whether to close again.
+    """
+
+    def __init__(self, failure_rate=0.5, min_calls=10, window_seconds=30, reset_timeout=30):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._calls = deque()
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                raise StripeUnavailable("Stripe is unavailable right now, please try again shortly.")
+            self._trial_in_flight = True
+
+    def record(self, ok):
+        with self._lock:
+            now = time.monotonic()
+            if self._opened_at is not None:
+                self._trial_in_flight = False
+                if ok:
+                    self._opened_at = None
+                    self._calls.clear()
+                    logger.info("Stripe circuit closed.")
+                else:
+                    self._opened_at = now
+                return
+
+            self._calls.append((now, ok))
+            while self._calls and self._calls[0][0] < now - self.window_seconds:
+                self._calls.popleft()
+
+            failures = sum(1 for _, call_ok in self._calls if not call_ok)
+            if len(self._calls) >= self.min_calls and failures / len(self._calls) >= self.failure_rate:
+                self._opened_at = now
+                logger.warning(
+                    "Stripe circuit opened: %s of %s calls failed in %ss.",
+                    failures, len(self._calls), self.window_seconds,
+                )
+
+
+class StripeGateway:
+    """
+    Stripe client with a keep-alive connection pool, connect/read deadlines,
+    bounded retries with full jitter and a circuit breaker.
+
+    Only connection errors, rate limits and 5xx responses are retried and
+    counted against the breaker; other Stripe errors are raised right away.
+    Point `api_base` at a local HTTP server to run it against a stand-in.
+    """
+    RETRYABLE_ERRORS = (
+        stripe.error.APIConnectionError,
+        stripe.error.RateLimitError,
+        stripe.error.APIError,
+    )
+
+    def __init__(
+        self,
+        api_key,
+        api_base=None,
+        connect_timeout=3.05,
+        read_timeout=10,
+        max_retries=2,
+        backoff=0.25,
+        pool_size=10,
+        breaker=None,
+    ):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        self._client = stripe.StripeClient(
+            api_key,
+            base_addresses={"api": api_base} if api_base else None,
+            http_client=stripe.RequestsClient(timeout=(connect_timeout, read_timeout), session=session),
+            max_network_retries=0,  # retries are handled in _call
+        )
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+
+    def create_checkout_session(self, params, idempotency_key=None):
+        options = {"idempotency_key": idempotency_key} if idempotency_key else {}
+        return self._call(self._client.v1.checkout.sessions.create, params=params, options=options)
+
+    def _call(self, method, **kwargs):
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                result = method(**kwargs)
+            except self.RETRYABLE_ERRORS:
+                self.breaker.record(False)
+                if attempt >= self.max_retries or self.breaker.is_open:
+                    raise
+                time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+                attempt += 1
+                continue
+            except Exception:
+                # Stripe answered and rejected the request; not a health signal
+                self.breaker.record(True)
+                raise
+            self.breaker.record(True)
+            return result
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_stripe_client():
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = StripeGateway(
+                    settings.STRIPE_SECRET_KEY,
+                    api_base=settings.STRIPE_API_BASE,
+                    connect_timeout=settings.STRIPE_CONNECT_TIMEOUT,
+                    read_timeout=settings.STRIPE_READ_TIMEOUT,
+                    max_retries=settings.STRIPE_MAX_RETRIES,
+                    pool_size=settings.STRIPE_POOL_SIZE,
+                    breaker=CircuitBreaker(
+                        failure_rate=settings.STRIPE_BREAKER_FAILURE_RATE,
+                        min_calls=settings.STRIPE_BREAKER_MIN_CALLS,
+                        reset_timeout=settings.STRIPE_BREAKER_RESET_TIMEOUT,
+                    ),
+                )
+    return _gateway
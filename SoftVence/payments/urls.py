@@ -1,8 +1,10 @@
 from django.urls import path
 from . import webhook as payment_views
+from . import views
 
 app_name = "payments"
 
 urlpatterns = [
     path("stripe/webhook/", payment_views.StripeWebhookAPIView.as_view(), name="stripe-webhook"),
+    path("export/", views.PaymentExportAPIView.as_view(), name="payment-export"),
 ]
\ No newline at end of file
@@ -0,0 +1,43 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import PermissionDenied
+from drf_spectacular.utils import extend_schema
+from common import Response, ValidationError
+from common.export import streaming_export
+from common.filters import list_filters
+from payments.models import Payment
+
+
+class PaymentExportAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+    EXPORT_FIELDS = (
+        "id", "intent_id", "status", "amount", "created_at", "updated_at",
+        "order__order_id", "order__status", "order__vendor_id", "order__customer__email",
+    )
+
+    @extend_schema(
+        summary="Export payments",
+        description=(
+            "Streams payments as CSV or JSON lines. Query params: export_format (csv|jsonl), "
+            "status, date_from, date_to (YYYY-MM-DD) and vendor (admin only). "
+            "Vendors only get payments of their own orders."
+        ),
+        responses={200: None},
+    )
+    def get(self, request):
+        user = request.user
+        if user.role not in ["vendor", "admin"]:
+            raise PermissionDenied("Only vendors and admin can export payments")
+
+        try:
+            filters = list_filters(request, Payment.CHOICESS, vendor_field="order__vendor_id")
+            queryset = Payment.objects.filter(**filters).order_by("id")
+            if user.role == "vendor":
+                queryset = queryset.filter(order__vendor__user=user)
+            return streaming_export(queryset, self.EXPORT_FIELDS, "payments", request.query_params.get("export_format", "csv"))
+        except ValidationError as e:
+            return Response(
+                success=False,
+                message=e.detail["message"],
+                status_code=e.detail["status_code"],
+            )
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Service, ServiceVariant
+from .models import Service, ServiceVariant, CatalogImport
 
 class ServiceAdmin(admin.ModelAdmin):
     list_display = ["id", "vendor", "name"]
@@ -9,5 +9,10 @@ class ServiceVariantAdmin(admin.ModelAdmin):
     list_display = ["id", "service", "name", "price"]
     ordering = ["-id"]
     
+class CatalogImportAdmin(admin.ModelAdmin):
+    list_display = ["id", "vendor", "status", "rows_processed", "rows_failed"]
+    ordering = ["-id"]
+    
 admin.site.register(Service, ServiceAdmin)
 admin.site.register(ServiceVariant, ServiceVariantAdmin)
+admin.site.register(CatalogImport, CatalogImportAdmin)
@@ -1,5 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_migrate
 
 
 class ServicesConfig(AppConfig):
     name = 'services'
+
+    def ready(self):
+        from services import signals
+        from services.celery import task
+        from services.search import create_search_extensions
+        pre_migrate.connect(create_search_extensions, sender=self)
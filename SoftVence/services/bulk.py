@@ -0,0 +1,83 @@
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from services.models import Service, ServiceVariant
+from .cache import invalidate_services
+from .search import refresh_search_documents
+from .summary import refresh_service_summaries
+from .serializers import ServiceVariantBulkItemSerializer
+
+BULK_MAX_ITEMS = 500
+
+
+def bulk_upsert_variants(user, items):
+    """
+    Create (no `id`) or update (`id` given) many variants for the user.
+
+    Ownership is checked once per distinct service and once for all updated
+    variants; valid items are written with bulk_create/bulk_update in one
+    transaction. Returns (results, errors), both keyed by item index.
+    """
+    errors = []
+    valid = []
+    for index, item in enumerate(items):
+        serializer = ServiceVariantBulkItemSerializer(data=item, partial=isinstance(item, dict) and "id" in item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({"index": index, "errors": serializer.errors})
+
+    service_ids = {data["service"] for _, data in valid if "service" in data}
+    services = Service.objects.filter(id__in=service_ids)
+    variant_ids = [data["id"] for _, data in valid if "id" in data]
+    variants = ServiceVariant.objects.filter(id__in=variant_ids)
+    if user.role != "admin":
+        services = services.filter(vendor__user=user)
+        variants = variants.filter(service__vendor__user=user)
+    owned_services = set(services.values_list("id", flat=True))
+    existing = variants.in_bulk()
+
+    to_create, to_update, update_fields = [], [], {"updated_at"}
+    now = timezone.now()
+    for index, data in valid:
+        if "service" in data and data["service"] not in owned_services:
+            errors.append({"index": index, "errors": "You cannot add variants to another vendor's service"})
+            continue
+
+        if "id" not in data:
+            if user.role != "vendor":
+                errors.append({"index": index, "errors": "Only vendors can create service variants"})
+                continue
+            fields = {key: value for key, value in data.items() if key != "service"}
+            fields.setdefault("estimated_minutes", timedelta(0))
+            to_create.append((index, ServiceVariant(service_id=data["service"], **fields)))
+            continue
+
+        variant = existing.get(data["id"])
+        if variant is None:
+            errors.append({"index": index, "errors": "Service variant not found"})
+            continue
+        for field, value in data.items():
+            if field == "id":
+                continue
+            attname = "service_id" if field == "service" else field
+            setattr(variant, attname, value)
+            update_fields.add(attname)
+        variant.updated_at = now
+        to_update.append((index, variant))
+
+    with transaction.atomic():
+        ServiceVariant.objects.bulk_create([variant for _, variant in to_create])
+        if to_update:
+            ServiceVariant.objects.bulk_update([variant for _, variant in to_update], sorted(update_fields))
+        # bulk writes skip post_save
+        service_ids = {variant.service_id for _, variant in to_create + to_update}
+        invalidate_services(service_ids)
+        refresh_search_documents(service_ids)
+        refresh_service_summaries(service_ids)
+
+    results = [{"index": index, "id": variant.id, "created": True} for index, variant in to_create]
+    results += [{"index": index, "id": variant.id, "created": False} for index, variant in to_update]
+    results.sort(key=lambda result: result["index"])
+    errors.sort(key=lambda error: error["index"])
+    return results, errors
@@ -0,0 +1,85 @@
+import hashlib
+import time
+from django.core.cache import cache
+from django.db import transaction
+from common.utils import acquire_lock, release_lock
+
+CATALOG_CACHE_TIMEOUT = 60 * 15
+REBUILD_LOCK_TTL = 10
+REBUILD_WAIT_SECONDS = 2
+REBUILD_POLL_INTERVAL = 0.05
+
+LIST_VERSION_KEY = "catalog:list:version"
+SERVICE_VERSION_KEY = "catalog:service:{}:version"
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # time based seed so a lost version key can never revive old entries
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def list_cache_key(request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"catalog:list:v{_get_version(LIST_VERSION_KEY)}:{path}"
+
+
+def detail_cache_key(pk):
+    version = _get_version(SERVICE_VERSION_KEY.format(pk))
+    return f"catalog:service:{pk}:v{version}"
+
+
+def invalidate_services(service_ids, lists=True):
+    """
+    Bump the version of every given service, and the catalog list version
+    unless lists=False, once the current transaction commits.
+    """
+    service_ids = [pk for pk in service_ids if pk is not None]
+
+    def bump():
+        if lists:
+            _bump_version(LIST_VERSION_KEY)
+        for pk in service_ids:
+            _bump_version(SERVICE_VERSION_KEY.format(pk))
+
+    transaction.on_commit(bump)
+
+
+def get_or_build(key, build, timeout=CATALOG_CACHE_TIMEOUT):
+    """
+    Return the cached value for key, calling build() on a miss.
+
+    Only one caller rebuilds a cold key; concurrent callers wait for that
+    rebuild to land instead of all hitting the database.
+    """
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    lock_key = f"{key}:lock"
+    token = acquire_lock(lock_key, ttl=REBUILD_LOCK_TTL)
+    if token is None:
+        deadline = time.monotonic() + REBUILD_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(REBUILD_POLL_INTERVAL)
+            data = cache.get(key)
+            if data is not None:
+                return data
+        return build()
+
+    try:
+        data = build()
+        cache.set(key, data, timeout)
+        return data
+    finally:
+        release_lock(lock_key, token)
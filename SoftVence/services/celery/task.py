@@ -0,0 +1,20 @@
+import logging
+from celery import shared_task
+from django.utils import timezone
+from services.imports import run_catalog_import
+from services.models import CatalogImport
+
+logger = logging.getLogger(__name__)
+
+IMPORT_MAX_RETRIES = 3
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_kwargs={"max_retries": IMPORT_MAX_RETRIES, "countdown": 10})
+def import_catalog(self, import_id):
+    try:
+        run_catalog_import(import_id)
+    except Exception:
+        if self.request.retries >= IMPORT_MAX_RETRIES:
+            CatalogImport.objects.filter(id=import_id).update(status="failed", updated_at=timezone.now())
+            logger.exception("Catalog import %s failed.", import_id)
+        raise
+    return True
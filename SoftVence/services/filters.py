@@ -0,0 +1,68 @@
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+from common import CursorPagination, ValidationError
+
+# ?ordering= value -> cursor ordering on the service summary columns
+CATALOG_ORDERINGS = {
+    "newest": ("-id",),
+    "price": ("min_price", "id"),
+    "-price": ("-min_price", "-id"),
+    "duration": ("min_duration", "id"),
+    "-duration": ("-min_duration", "-id"),
+}
+
+# bounds max_minutes so the timedelta cannot overflow
+MAX_MINUTES = 100000
+
+
+def _decimal(params, name):
+    value = params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        value = Decimal(value)
+    except InvalidOperation:
+        raise ValidationError(f"{name} must be a number")
+    if not value.is_finite() or value < 0:
+        raise ValidationError(f"{name} must be a positive number")
+    return value
+
+
+def filter_catalog(queryset, params):
+    """
+    Apply the catalog query params, all on Service summary columns:
+    min_price / max_price (the service's cheapest..dearest variant range
+    overlaps the requested range; a variant inside it is not guaranteed),
+    max_minutes (shortest variant duration) and in_stock=1.
+    """
+    min_price = _decimal(params, "min_price")
+    max_price = _decimal(params, "max_price")
+    max_minutes = _decimal(params, "max_minutes")
+    if max_minutes is not None and max_minutes > MAX_MINUTES:
+        raise ValidationError(f"max_minutes must be at most {MAX_MINUTES}")
+
+    if min_price is not None:
+        queryset = queryset.filter(max_price__gte=min_price)
+    if max_price is not None:
+        queryset = queryset.filter(min_price__lte=max_price)
+    if max_minutes is not None:
+        queryset = queryset.filter(min_duration__lte=timedelta(minutes=float(max_minutes)))
+    if params.get("in_stock") in ("1", "true"):
+        queryset = queryset.filter(total_stock__gt=0)
+
+    ordering = params.get("ordering")
+    if ordering in ("price", "-price"):
+        queryset = queryset.filter(min_price__isnull=False)
+    elif ordering in ("duration", "-duration"):
+        queryset = queryset.filter(min_duration__isnull=False)
+    return queryset
+
+
+class CatalogPagination(CursorPagination):
+    """
+    Cursor pagination with the ?ordering= param mapped to one of
+    CATALOG_ORDERINGS, each backed by a partial catalog index.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        return CATALOG_ORDERINGS.get(request.query_params.get("ordering"), CATALOG_ORDERINGS["newest"])
@@ -0,0 +1,154 @@
+import codecs
+import csv
+import json
+import logging
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from django.db import transaction
+from django.utils import timezone
+from vendors.models import Vendor
+from .cache import invalidate_services
+from .filters import MAX_MINUTES
+from .search import refresh_search_documents
+from .summary import refresh_service_summaries
+from .models import CatalogImport, Service, ServiceVariant
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 2000
+MAX_STORED_ERRORS = 100
+# column ranges: DecimalField(max_digits=10, decimal_places=2) and IntegerField
+MAX_PRICE = Decimal("99999999.99")
+MAX_STOCK = 2**31 - 1
+
+
+def _read_rows(handle, file_format):
+    text = codecs.getreader("utf-8-sig")(handle)
+    if file_format == "csv":
+        yield from csv.DictReader(text)
+        return
+    for line in text:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def _parse_row(row):
+    if not isinstance(row, dict):
+        raise ValueError("invalid JSON line")
+    service = (row.get("service") or "").strip()
+    variant = (row.get("variant") or "").strip()
+    if not service or not variant:
+        raise ValueError("service and variant are required")
+    if len(service) > 255 or len(variant) > 50:
+        raise ValueError("service or variant name is too long")
+    try:
+        price = Decimal(str(row.get("price")))
+        stock = int(row.get("stock") or 0)
+        minutes = int(row.get("estimated_minutes") or 0)
+        if not price.is_finite():
+            raise ValueError
+        price = price.quantize(Decimal("0.01"))
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError("price, stock and estimated_minutes must be numbers")
+    if price < 0 or stock < 0 or minutes < 0:
+        raise ValueError("price, stock and estimated_minutes cannot be negative")
+    if price > MAX_PRICE or stock > MAX_STOCK or minutes > MAX_MINUTES:
+        raise ValueError(
+            f"price, stock and estimated_minutes must be at most {MAX_PRICE}, {MAX_STOCK} and {MAX_MINUTES}"
+        )
+    return service, variant, {"price": price, "stock": stock, "estimated_minutes": timedelta(minutes=minutes)}
+
+
+def _upsert_chunk(vendor, rows):
+    """
+    Upsert one chunk keyed by (service name, variant name): one query for
+    existing services, one for existing variants, then bulk writes.
+    """
+    service_names = {service for service, _, _ in rows}
+    services = {}
+    for service in Service.objects.filter(vendor=vendor, name__in=service_names).order_by("id"):
+        services.setdefault(service.name, service)
+    missing = [Service(vendor=vendor, name=name) for name in service_names if name not in services]
+    for service in Service.objects.bulk_create(missing):
+        services[service.name] = service
+
+    service_ids = [service.id for service in services.values()]
+    variant_names = {variant for _, variant, _ in rows}
+    variants = {}
+    for variant in ServiceVariant.objects.filter(service_id__in=service_ids, name__in=variant_names).order_by("id"):
+        variants.setdefault((variant.service_id, variant.name), variant)
+
+    now = timezone.now()
+    to_create = {}
+    to_update = {}
+    for service_name, variant_name, fields in rows:
+        key = (services[service_name].id, variant_name)
+        variant = variants.get(key)
+        if variant is None:
+            # last row wins within a chunk
+            to_create[key] = ServiceVariant(service_id=key[0], name=variant_name, **fields)
+            continue
+        for field, value in fields.items():
+            setattr(variant, field, value)
+        variant.updated_at = now
+        to_update[key] = variant
+
+    ServiceVariant.objects.bulk_create(to_create.values())
+    ServiceVariant.objects.bulk_update(to_update.values(), ["price", "stock", "estimated_minutes", "updated_at"])
+    invalidate_services(service_ids)
+    refresh_search_documents(service_ids)
+    refresh_service_summaries(service_ids)
+
+
+def run_catalog_import(import_id, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Stream the import file and upsert it chunk by chunk. Every chunk
+    commits together with the rows_processed checkpoint, so a retried job
+    skips what is already in and continues where it stopped.
+    """
+    catalog_import = CatalogImport.objects.select_related("vendor").get(id=import_id)
+    if catalog_import.status == "completed":
+        return catalog_import
+
+    CatalogImport.objects.filter(id=import_id).update(status="running", updated_at=timezone.now())
+    with catalog_import.file.open("rb") as handle:
+        rows = _read_rows(handle, catalog_import.file_format)
+        skipped = sum(1 for _ in islice(rows, catalog_import.rows_processed))
+        logger.info("Catalog import %s resuming after %s rows.", import_id, skipped)
+
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            parsed, errors = [], []
+            for offset, row in enumerate(chunk):
+                try:
+                    parsed.append(_parse_row(row))
+                except ValueError as e:
+                    errors.append({"row": catalog_import.rows_processed + offset + 1, "error": str(e)})
+
+            with transaction.atomic():
+                # serialises imports of the same vendor so the name lookups stay valid
+                Vendor.objects.select_for_update().filter(id=catalog_import.vendor_id).first()
+                if parsed:
+                    _upsert_chunk(catalog_import.vendor, parsed)
+                catalog_import.rows_processed += len(chunk)
+                catalog_import.rows_failed += len(errors)
+                stored = MAX_STORED_ERRORS - len(catalog_import.errors)
+                if stored > 0:
+                    catalog_import.errors += errors[:stored]
+                catalog_import.save(update_fields=["rows_processed", "rows_failed", "errors", "updated_at"])
+
+    catalog_import.status = "completed"
+    catalog_import.save(update_fields=["status", "updated_at"])
+    logger.info(
+        "Catalog import %s completed: %s rows, %s failed.",
+        import_id, catalog_import.rows_processed, catalog_import.rows_failed,
+    )
+    return catalog_import
@@ -0,0 +1,58 @@
+import os
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from services.celery.task import import_catalog
+from services.imports import run_catalog_import
+from services.models import CatalogImport
+from vendors.models import Vendor
+
+
+class Command(BaseCommand):
+    help = (
+        "Import services and variants for a vendor from a CSV or JSONL file "
+        "(service, variant, price, estimated_minutes, stock). Pass --resume <import id> "
+        "to continue an interrupted import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("vendor_id", type=int, nargs="?")
+        parser.add_argument("path", nargs="?")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension.")
+        parser.add_argument("--resume", type=int, help="Id of an existing import to continue.")
+        parser.add_argument("--async", action="store_true", dest="run_async", help="Queue the import on Celery.")
+
+    def handle(self, *args, **options):
+        if options["resume"]:
+            catalog_import = CatalogImport.objects.filter(id=options["resume"]).first()
+            if not catalog_import:
+                raise CommandError(f"Import {options['resume']} does not exist")
+        else:
+            catalog_import = self._create_import(options)
+
+        if options["run_async"]:
+            import_catalog.delay(catalog_import.id)
+            self.stdout.write(f"Import {catalog_import.id} queued.")
+            return
+
+        catalog_import = run_catalog_import(catalog_import.id)
+        self.stdout.write(self.style.SUCCESS(
+            f"Import {catalog_import.id}: {catalog_import.rows_processed} rows, {catalog_import.rows_failed} failed."
+        ))
+
+    def _create_import(self, options):
+        path = options["path"]
+        if not options["vendor_id"] or not path:
+            raise CommandError("vendor_id and path are required unless --resume is given")
+        vendor = Vendor.objects.filter(id=options["vendor_id"]).first()
+        if not vendor:
+            raise CommandError(f"Vendor {options['vendor_id']} does not exist")
+        if not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+
+        file_format = options["format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+        with open(path, "rb") as handle:
+            return CatalogImport.objects.create(
+                vendor=vendor,
+                file=File(handle, name=os.path.basename(path)),
+                file_format=file_format,
+            )
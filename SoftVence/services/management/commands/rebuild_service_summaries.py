@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from services.models import Service
+from services.summary import refresh_service_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the variant summary columns (price, duration, stock, count) of every service in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        total = 0
+        while True:
+            ids = list(
+                Service.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            refresh_service_summaries(ids)
+            last_id = ids[-1]
+            total += len(ids)
+            self.stdout.write(f"{total} services summarized")
+        self.stdout.write(self.style.SUCCESS(f"Summaries rebuilt for {total} services."))
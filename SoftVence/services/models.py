@@ -1,13 +1,31 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from vendors.models import Vendor
 from common import ValidationError as CommonValidationError
         
-class ServiceManager(models.Manager):
+class ServiceQuerySet(models.QuerySet):
     def approved(self):
         return self.filter(is_approved=True, is_active=True)
     def active(self):
         return self.filter(is_active=True)
+    def in_catalog(self):
+        # approved services of active vendors
+        return self.approved().filter(vendor__is_active=True)
+    def catalog(self):
+        # in_catalog(), ready for ServiceRetriveListSerializer
+        return self.in_catalog().with_vendor_and_variants()
+    def with_owner(self):
+        # owning user id for common.permission, read in the same query
+        return self.annotate(owner_id=models.F("vendor__user_id"))
+    def with_vendor_and_variants(self):
+        return self.select_related("vendor__user").prefetch_related(
+            models.Prefetch("variants", queryset=ServiceVariant.objects.order_by("id"))
+        )
+
+class ServiceManager(models.Manager.from_queryset(ServiceQuerySet)):
+    pass
 
 class Service(models.Model):
     vendor = models.ForeignKey(Vendor, on_delete=models.CASCADE, related_name="service_vendor")
@@ -16,21 +34,54 @@ class Service(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # search document, maintained by services.search.refresh_search_documents
+    search_vector = SearchVectorField(null=True, editable=False)
+    search_text = models.TextField(blank=True, default="", editable=False)
+    # variant summary, maintained by services.summary
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    min_duration = models.DurationField(null=True, blank=True, editable=False)
+    total_stock = models.IntegerField(default=0, editable=False)
+    variant_count = models.IntegerField(default=0, editable=False)
     
     objects = ServiceManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_approved", "is_active"], name="service_approved_active_idx"),
+            # catalog(): approved + active, paged on -id
+            models.Index(fields=["id"], condition=models.Q(is_approved=True, is_active=True), name="service_catalog_idx"),
+            # catalog filters and sorts on the variant summary
+            models.Index(fields=["min_price", "id"], condition=models.Q(is_approved=True, is_active=True), name="service_catalog_price_idx"),
+            models.Index(fields=["min_duration", "id"], condition=models.Q(is_approved=True, is_active=True), name="service_catalog_duration_idx"),
+            models.Index(fields=["id"], condition=models.Q(is_approved=True, is_active=True, total_stock__gt=0), name="service_catalog_in_stock_idx"),
+            # catalog search
+            GinIndex(fields=["search_vector"], name="service_search_vector_idx"),
+            GinIndex(OpClass("search_text", name="gin_trgm_ops"), name="service_search_trgm_idx"),
+        ]
     
     def __str__(self):
         return f"{self.name}- vendor: {self.vendor.user.email}"
 
   
-class ServiceVariantManager(models.Manager):
+class ServiceVariantQuerySet(models.QuerySet):
     def available(self):
         return self.filter(stock__gt=0)
     def out_of_stock(self):
         return self.filter(stock__lte=0)
+    def with_service(self):
+        return self.select_related("service__vendor__user")
+    def with_owner(self):
+        return self.annotate(owner_id=models.F("service__vendor__user_id"))
+
+class ServiceVariantManager(models.Manager.from_queryset(ServiceVariantQuerySet)):
+    pass
 
 class ServiceVariant(models.Model):
-    service = models.ForeignKey(Service, on_delete=models.CASCADE, blank=True, null=True, related_name="variants")
+    # variant_service_stock_idx leads with service; no separate FK index
+    service = models.ForeignKey(
+        Service, on_delete=models.CASCADE, blank=True, null=True, related_name="variants", db_index=False
+    )
     name = models.CharField(max_length=50)   
     price = models.DecimalField(max_digits=10, decimal_places=2)
     estimated_minutes = models.DurationField(default=0)
@@ -40,6 +91,17 @@ class ServiceVariant(models.Model):
 
     objects = ServiceVariantManager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["service", "stock"], name="variant_service_stock_idx"),
+            # available() / out_of_stock()
+            models.Index(fields=["service"], condition=models.Q(stock__gt=0), name="variant_available_idx"),
+            models.Index(fields=["service"], condition=models.Q(stock__lte=0), name="variant_out_of_stock_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(stock__gte=0), name="variant_stock_non_negative"),
+        ]
+
     def __str__(self):
         return f"{self.name}- price: {self.price}"
     
@@ -49,8 +111,40 @@ class ServiceVariant(models.Model):
         return super().clean()
     
     def save(self, *args, **kwargs):
+        # the stock check constraint validates in the write itself, no extra
+        # query; the savepoint keeps a violation from aborting the caller's transaction
         try:
-            self.full_clean()
-        except ValidationError as e:
-            raise CommonValidationError(message=e.message, status_code=400)
-        super().save(*args, **kwargs)
\ No newline at end of file
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except IntegrityError as e:
+            if "variant_stock_non_negative" in str(e):
+                raise CommonValidationError("Stock cannot be negative")
+            raise
+
+class CatalogImport(models.Model):
+    STATUS = (
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    )
+    FORMATS = (
+        ("csv", "CSV"),
+        ("jsonl", "JSON Lines"),
+    )
+
+    vendor = models.ForeignKey(Vendor, on_delete=models.CASCADE, related_name="catalog_imports")
+    file = models.FileField(upload_to="imports/")
+    file_format = models.CharField(max_length=10, choices=FORMATS, default="csv")
+    status = models.CharField(max_length=20, choices=STATUS, default="pending")
+    rows_processed = models.PositiveIntegerField(default=0)  # resume checkpoint
+    rows_failed = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-id"]
+
+    def __str__(self):
+        return f"Import {self.id} - vendor: {self.vendor_id} ({self.status})"
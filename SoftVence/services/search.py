@@ -0,0 +1,77 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import F, OuterRef, Q, Subquery, TextField, Value
+from django.db.models.functions import Coalesce, Concat
+from vendors.models import Vendor
+from .models import Service, ServiceVariant
+
+SEARCH_CONFIG = "english"
+
+
+def _search_document():
+    """
+    Column values for Service.search_vector / search_text, computed in SQL
+    from the service name (weight A), vendor business name (B) and variant
+    names (C).
+    """
+    vendor_name = Coalesce(
+        Subquery(Vendor.objects.filter(id=OuterRef("vendor_id")).values("business_name")[:1]),
+        Value(""),
+        output_field=TextField(),
+    )
+    variant_names = Coalesce(
+        Subquery(
+            ServiceVariant.objects.filter(service_id=OuterRef("id"))
+            .order_by()
+            .values("service_id")
+            .annotate(names=StringAgg("name", delimiter=" "))
+            .values("names")
+        ),
+        Value(""),
+        output_field=TextField(),
+    )
+    return {
+        "search_vector": (
+            SearchVector("name", weight="A", config=SEARCH_CONFIG)
+            + SearchVector(vendor_name, weight="B", config=SEARCH_CONFIG)
+            + SearchVector(variant_names, weight="C", config=SEARCH_CONFIG)
+        ),
+        "search_text": Concat(
+            "name", Value(" "), vendor_name, Value(" "), variant_names, output_field=TextField()
+        ),
+    }
+
+
+def refresh_search_documents(service_ids):
+    """
+    Rebuild the search documents of the given services with one UPDATE.
+    Called from every catalog write path (signals, bulk upsert, imports).
+    """
+    service_ids = [pk for pk in service_ids if pk is not None]
+    if service_ids:
+        Service.objects.filter(id__in=service_ids).update(**_search_document())
+
+
+def search_services(queryset, text):
+    """
+    Filter queryset to services matching text and order them by relevance.
+
+    Whole words hit the GIN tsvector index (`websearch` syntax: quotes,
+    `or`, `-word`); typos and word prefixes hit the GIN trigram index on
+    search_text.
+    """
+    query = SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+    return (
+        queryset.filter(Q(search_vector=query) | Q(search_text__trigram_word_similar=text))
+        .annotate(rank=SearchRank(F("search_vector"), query) + TrigramWordSimilarity(text, "search_text"))
+        .order_by("-rank", "-id")
+    )
+
+
+def create_search_extensions(**kwargs):
+    # pg_trgm backs the trigram index; migrations are generated locally,
+    # so the extension is created here instead of in a migration
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
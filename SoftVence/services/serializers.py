@@ -1,8 +1,9 @@
 from rest_framework import serializers
-from .models import Service, ServiceVariant
+from .models import Service, ServiceVariant, CatalogImport
 from vendors.models import Vendor
 from accounts.models import User
 from common import ValidationError
+from common.projection import ProjectionSerializer, decimal_str, duration_str
 
 class VendorUserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -22,6 +23,12 @@ class VendorRetrieveSerializer(serializers.ModelSerializer):
         fields = ["id", "user", "business_name", "address", "is_active"]
         
 class ServiceVariantCreateUpdateSerializer(serializers.ModelSerializer):
+    # loads the service with its owner id, so ownership needs no extra query
+    service = serializers.PrimaryKeyRelatedField(
+        queryset=Service.objects.with_owner(), allow_null=True, required=False
+    )
+    stock = serializers.IntegerField(min_value=0, required=False)
+
     class Meta:
         model = ServiceVariant
         fields = ["id", "service", "name", "price", "estimated_minutes", "stock"]
@@ -45,6 +52,55 @@ class ServiceRetriveListSerializer(serializers.ModelSerializer):
         model = Service
         fields = ["id", "name", "is_approved", "is_active", "vendor", "variants"]
         
+class ServiceListProjection(ProjectionSerializer):
+    """
+    ServiceRetriveListSerializer's JSON built from values() rows; the
+    variants of a whole page are read with one query in prepare().
+    """
+    columns = (
+        "id", "name", "is_approved", "is_active",
+        "vendor_id", "vendor__business_name", "vendor__address", "vendor__is_active",
+        "vendor__user_id", "vendor__user__email", "vendor__user__role",
+    )
+    variant_fields = ("id", "service_id", "name", "price", "estimated_minutes", "stock")
+
+    def prepare(self, rows):
+        self.variants = {row["id"]: [] for row in rows}
+        variants = (
+            ServiceVariant.objects.filter(service_id__in=list(self.variants))
+            .order_by("id")
+            .values_list(*self.variant_fields)
+        )
+        for pk, service_id, name, price, estimated_minutes, stock in variants:
+            self.variants[service_id].append({
+                "id": pk,
+                "name": name,
+                "price": decimal_str(price),
+                "estimated_minutes": duration_str(estimated_minutes),
+                "stock": stock,
+            })
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "is_approved": row["is_approved"],
+            "is_active": row["is_active"],
+            "vendor": {
+                "id": row["vendor_id"],
+                "user": {
+                    "id": row["vendor__user_id"],
+                    "email": row["vendor__user__email"],
+                    "role": row["vendor__user__role"],
+                },
+                "business_name": row["vendor__business_name"],
+                "address": row["vendor__address"],
+                "is_active": row["vendor__is_active"],
+            },
+            "variants": self.variants.get(row["id"], []),
+        }
+
+
 class ServiceCreateUpdateSerializer(serializers.ModelSerializer):
     
     class Meta:
@@ -80,4 +136,29 @@ class ServiceCreateUpdateSerializer(serializers.ModelSerializer):
 class ServiceApproveSerializer(serializers.ModelSerializer):
     class Meta:
         model = Service
-        fields = ["is_approved"]
\ No newline at end of file
+        fields = ["is_approved"]
+
+class ServiceVariantBulkItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField(required=False)
+    service = serializers.IntegerField()
+    name = serializers.CharField(max_length=50)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    estimated_minutes = serializers.DurationField(required=False)
+    stock = serializers.IntegerField(min_value=0, required=False)
+
+
+class CatalogImportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CatalogImport
+        fields = ["id", "file_format", "status", "rows_processed", "rows_failed", "errors", "created_at", "updated_at"]
+
+
+class CatalogImportUploadSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(choices=CatalogImport.FORMATS, required=False)
+
+    def validate(self, attrs):
+        if "file_format" not in attrs:
+            name = attrs["file"].name.lower()
+            attrs["file_format"] = "jsonl" if name.endswith((".jsonl", ".ndjson")) else "csv"
+        return attrs
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from services.models import Service, ServiceVariant
+from vendors.models import Vendor
+from .cache import invalidate_services
+from .search import refresh_search_documents
+from .summary import refresh_service_summaries
+
+
+@receiver([post_save, post_delete], sender=Service)
+def invalidate_service_cache(sender, instance, **kwargs):
+    invalidate_services([instance.pk])
+    if kwargs["signal"] is post_save:
+        refresh_search_documents([instance.pk])
+        # a full save writes back the summary it loaded; recompute it
+        refresh_service_summaries([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=ServiceVariant)
+def invalidate_service_variant_cache(sender, instance, **kwargs):
+    invalidate_services([instance.service_id])
+    refresh_search_documents([instance.service_id])
+    refresh_service_summaries([instance.service_id])
+
+
+@receiver(post_save, sender=Vendor)
+def invalidate_vendor_cache(sender, instance, **kwargs):
+    service_ids = list(Service.objects.filter(vendor=instance).values_list("id", flat=True))
+    invalidate_services(service_ids)
+    refresh_search_documents(service_ids)
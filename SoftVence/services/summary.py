@@ -0,0 +1,79 @@
+from datetime import timedelta
+from django.db.models import Count, F, IntegerField, Max, Min, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from .models import Service, ServiceVariant
+
+PRICE_FACETS = ((0, 500), (500, 1000), (1000, 2000), (2000, None))
+DURATION_FACETS = ((0, 30), (30, 60), (60, 120), (120, None))
+
+
+def _variant_aggregate(aggregate):
+    return Subquery(
+        ServiceVariant.objects.filter(service_id=OuterRef("id"))
+        .order_by()
+        .values("service_id")
+        .annotate(value=aggregate)
+        .values("value")
+    )
+
+
+def refresh_service_summaries(service_ids):
+    """
+    Recompute the variant summary columns of the given services from their
+    variants with one UPDATE. Called from every variant write path
+    (signals, bulk upsert, imports).
+    """
+    service_ids = [pk for pk in service_ids if pk is not None]
+    if not service_ids:
+        return
+    Service.objects.filter(id__in=service_ids).update(
+        min_price=_variant_aggregate(Min("price")),
+        max_price=_variant_aggregate(Max("price")),
+        min_duration=_variant_aggregate(Min("estimated_minutes")),
+        total_stock=Coalesce(_variant_aggregate(Sum("stock")), Value(0), output_field=IntegerField()),
+        variant_count=Coalesce(_variant_aggregate(Count("id")), Value(0), output_field=IntegerField()),
+    )
+
+
+def adjust_total_stock(service_id, delta):
+    """
+    Apply a stock change made with a conditional F() update on a variant
+    (reservations) to its service, as a delta so concurrent orders add up.
+    """
+    if service_id is not None and delta:
+        Service.objects.filter(id=service_id).update(total_stock=F("total_stock") + delta)
+
+
+def _bucket(field, low, high):
+    condition = Q(**{f"{field}__gte": low})
+    if high is not None:
+        condition &= Q(**{f"{field}__lt": high})
+    return condition
+
+
+def catalog_facets(queryset):
+    """
+    Facet counts over a filtered catalog queryset in one aggregate query:
+    in stock, "from" price buckets and shortest duration buckets (minutes).
+    """
+    aggregates = {"total": Count("id"), "in_stock": Count("id", filter=Q(total_stock__gt=0))}
+    for low, high in PRICE_FACETS:
+        aggregates[f"price_{low}"] = Count("id", filter=_bucket("min_price", low, high))
+    for low, high in DURATION_FACETS:
+        aggregates[f"duration_{low}"] = Count(
+            "id",
+            filter=_bucket(
+                "min_duration", timedelta(minutes=low), timedelta(minutes=high) if high is not None else None
+            ),
+        )
+    counts = queryset.order_by().aggregate(**aggregates)
+    return {
+        "total": counts["total"],
+        "in_stock": counts["in_stock"],
+        "price": [
+            {"min": low, "max": high, "count": counts[f"price_{low}"]} for low, high in PRICE_FACETS
+        ],
+        "duration": [
+            {"min": low, "max": high, "count": counts[f"duration_{low}"]} for low, high in DURATION_FACETS
+        ],
+    }
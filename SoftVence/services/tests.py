@@ -1,3 +1,197 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from unittest import skipUnless
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from accounts.models import User
+from common import ValidationError
+from services.imports import _parse_row, run_catalog_import
+from services.models import CatalogImport, Service, ServiceVariant
+from services.serializers import ServiceVariantCreateUpdateSerializer
+from services.views import ServiceCustomerListView
+from vendors.models import Vendor
 
-# Create your tests here.
+
+@skipUnless(connection.vendor == "postgresql", "query plans are checked on PostgreSQL")
+class CatalogQueryPlanTests(TestCase):
+    """
+    EXPLAIN the catalog querysets the views and managers actually build,
+    over a seeded and ANALYZEd catalog shaped like production: most
+    services listed, a few pending approval or in stock, most variants in
+    stock. Each query must use its own index and no sequential scan.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create(
+            [User(email=f"vendor{i}@example.com", role="vendor") for i in range(50)]
+        )
+        vendors = Vendor.objects.bulk_create(
+            [Vendor(user=user, business_name=f"Vendor {i}", address="-") for i, user in enumerate(users)]
+        )
+        services = []
+        for i in range(20000):
+            services.append(Service(
+                vendor=vendors[i % len(vendors)],
+                name=f"Service {i}",
+                # 2% pending approval, 2% deactivated
+                is_approved=i % 50 != 1,
+                is_active=i % 50 != 2,
+                min_price=Decimal(100 + i % 900),
+                max_price=Decimal(1000 + i % 900),
+                min_duration=timedelta(minutes=15 + i % 120),
+                # 2% in stock
+                total_stock=5 if i % 50 == 3 else 0,
+            ))
+        services = Service.objects.bulk_create(services, batch_size=5000)
+        variants = []
+        for i, service in enumerate(services):
+            for n in range(3):
+                # 1% of variants sold out
+                stock = 0 if (i * 3 + n) % 100 == 0 else 5
+                variants.append(ServiceVariant(
+                    service=service, name=f"Variant {n}", price=Decimal(500),
+                    estimated_minutes=timedelta(minutes=30), stock=stock,
+                ))
+        ServiceVariant.objects.bulk_create(variants, batch_size=5000)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        cls.service_id = services[len(services) // 2].id
+
+    def catalog_page(self, **params):
+        view = ServiceCustomerListView()
+        view.request = Request(APIRequestFactory().get("/", params))
+        queryset = view.get_queryset()
+        ordering = view.paginator.get_ordering(view.request, queryset, view)
+        return queryset.order_by(*ordering)[: view.paginator.page_size + 1]
+
+    def assertUsesIndex(self, queryset, index_name, table):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+        self.assertNotIn(f"Seq Scan on {table}", plan, plan)
+
+    def test_catalog_newest_uses_catalog_index(self):
+        self.assertUsesIndex(self.catalog_page(), "service_catalog_idx", "services_service")
+
+    def test_catalog_by_price_uses_price_index(self):
+        self.assertUsesIndex(self.catalog_page(ordering="price"), "service_catalog_price_idx", "services_service")
+
+    def test_catalog_by_duration_uses_duration_index(self):
+        self.assertUsesIndex(
+            self.catalog_page(ordering="duration"), "service_catalog_duration_idx", "services_service"
+        )
+
+    def test_catalog_in_stock_uses_in_stock_index(self):
+        self.assertUsesIndex(self.catalog_page(in_stock="1"), "service_catalog_in_stock_idx", "services_service")
+
+    def test_approval_queue_uses_approved_active_index(self):
+        queryset = Service.objects.active().filter(is_approved=False)
+        self.assertUsesIndex(queryset, "service_approved_active_idx", "services_service")
+
+    def test_available_variants_use_available_index(self):
+        queryset = ServiceVariant.objects.available().filter(service_id=self.service_id)
+        self.assertUsesIndex(queryset, "variant_available_idx", "services_servicevariant")
+
+    def test_out_of_stock_variants_use_out_of_stock_index(self):
+        self.assertUsesIndex(
+            ServiceVariant.objects.out_of_stock(), "variant_out_of_stock_idx", "services_servicevariant"
+        )
+
+    def test_stock_summary_uses_service_stock_index(self):
+        queryset = (
+            ServiceVariant.objects.filter(service_id=self.service_id)
+            .order_by()
+            .values("service_id")
+            .annotate(total=Sum("stock"))
+        )
+        self.assertUsesIndex(queryset, "variant_service_stock_idx", "services_servicevariant")
+
+
+class CatalogImportRowTests(SimpleTestCase):
+    def row(self, **values):
+        return {"service": "Screen repair", "variant": "Standard", "price": "500", "stock": "3", **values}
+
+    def assertRejected(self, **values):
+        with self.assertRaises(ValueError):
+            _parse_row(self.row(**values))
+
+    def test_valid_row(self):
+        service, variant, fields = _parse_row(self.row())
+        self.assertEqual((service, variant), ("Screen repair", "Standard"))
+        self.assertEqual(fields["price"], Decimal("500.00"))
+        self.assertEqual(fields["stock"], 3)
+
+    def test_non_finite_price_is_rejected(self):
+        for price in ("NaN", "-NaN", "sNaN", "Infinity", "-Infinity"):
+            with self.subTest(price=price):
+                self.assertRejected(price=price)
+
+    def test_negative_values_are_rejected(self):
+        self.assertRejected(price="-1")
+        self.assertRejected(stock="-1")
+        self.assertRejected(estimated_minutes="-5")
+
+    def test_values_beyond_the_columns_are_rejected(self):
+        self.assertRejected(price="100000000")
+        self.assertRejected(price="99999999.999")  # rounds up past max_digits
+        self.assertRejected(stock=str(2**31))
+        self.assertRejected(estimated_minutes="10000000000")
+
+
+class CatalogImportTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email="vendor@example.com", password=None, role="vendor")
+        self.vendor = Vendor.objects.create(user=user, business_name="Fixers", address="Dhaka")
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(MEDIA_ROOT=media.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_bad_rows_are_recorded_and_the_rest_imported(self):
+        content = (
+            "service,variant,price,estimated_minutes,stock\n"
+            "Screen repair,Standard,500,30,3\n"
+            "Screen repair,NaN price,NaN,30,3\n"
+            "Screen repair,Huge price,100000000,30,3\n"
+            "Screen repair,Huge stock,500,30,99999999999\n"
+            "Battery,Standard,800,45,2\n"
+        )
+        catalog_import = CatalogImport(vendor=self.vendor)
+        catalog_import.file.save("catalog.csv", ContentFile(content.encode()), save=True)
+
+        catalog_import = run_catalog_import(catalog_import.id)
+
+        self.assertEqual(catalog_import.status, "completed")
+        self.assertEqual(catalog_import.rows_processed, 5)
+        self.assertEqual(catalog_import.rows_failed, 3)
+        self.assertEqual([error["row"] for error in catalog_import.errors], [2, 3, 4])
+        self.assertEqual(ServiceVariant.objects.filter(service__vendor=self.vendor).count(), 2)
+
+
+class ServiceVariantStockTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email="vendor@example.com", password=None, role="vendor")
+        vendor = Vendor.objects.create(user=user, business_name="Fixers", address="Dhaka")
+        service = Service.objects.create(vendor=vendor, name="Screen repair", is_approved=True)
+        self.variant = ServiceVariant.objects.create(
+            service=service, name="Standard", price=Decimal("500.00"),
+            estimated_minutes=timedelta(minutes=30), stock=3,
+        )
+
+    def test_serializer_rejects_negative_stock(self):
+        serializer = ServiceVariantCreateUpdateSerializer(self.variant, data={"stock": -1}, partial=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("stock", serializer.errors)
+
+    def test_negative_stock_save_keeps_the_transaction_usable(self):
+        with transaction.atomic():
+            self.variant.stock = -1
+            with self.assertRaises(ValidationError):
+                self.variant.save()
+            self.assertEqual(ServiceVariant.objects.get(id=self.variant.id).stock, 3)
@@ -11,6 +11,10 @@ urlpatterns = router.urls
 
 urlpatterns += [
     path("customer/list/", view.ServiceCustomerListView.as_view(), name="service-list"),
+    path("customer/search/", view.ServiceCustomerSearchView.as_view(), name="service-search"),
+    path("customer/facets/", view.ServiceCustomerFacetsAPIView.as_view(), name="service-facets"),
     path("customer/<int:pk>/", view.ServiceCustomerRetrieveView.as_view(), name="service-detail"),
     path("admin/<int:pk>/approve/", view.ServiceAdminApproveAPIView.as_view(), name="service-approve"),
+    path("catalog-import/", view.CatalogImportAPIView.as_view(), name="catalog-import"),
+    path("catalog-import/<int:pk>/", view.CatalogImportDetailAPIView.as_view(), name="catalog-import-detail"),
 ]
\ No newline at end of file
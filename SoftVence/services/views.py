@@ -3,18 +3,36 @@ from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework import status, generics
 from common.validation_err import ValidationError
-from services.models import Service, ServiceVariant
-from .serializers import ServiceVariantSerializer, ServiceCreateUpdateSerializer, ServiceRetriveListSerializer, ServiceVariantCreateUpdateSerializer, ServiceVariantResponseSerializer, ServiceApproveSerializer
+from services.models import Service, ServiceVariant, CatalogImport
+from .serializers import ServiceVariantSerializer, ServiceCreateUpdateSerializer, ServiceRetriveListSerializer, ServiceVariantCreateUpdateSerializer, ServiceVariantResponseSerializer, ServiceApproveSerializer, ServiceVariantBulkItemSerializer, ServiceListProjection, CatalogImportSerializer, CatalogImportUploadSerializer
 from drf_spectacular.utils import extend_schema_view, extend_schema
 from rest_framework import serializers as drf_serializers
-from common import Response, IsVendorOrAdmin, IsAdminOrReadOnly
+from common import Response, IsVendorOrAdmin, IsAdminOrReadOnly, OwnedQuerysetMixin
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response as DRFResponse
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from django.db import transaction
+from vendors.models import Vendor
+from services.celery.task import import_catalog
+from .bulk import BULK_MAX_ITEMS, bulk_upsert_variants
+from .cache import get_or_build, list_cache_key, detail_cache_key
+from common.conditional import conditional_response, make_etag
+from common.renderers import ORJSONRenderer
+from common.permission import owner_id_of
+from common.pagination import OffsetPagination
+from drf_spectacular.utils import OpenApiParameter
+from .search import search_services
+from .filters import CatalogPagination, filter_catalog
+from .summary import catalog_facets
+from rest_framework.renderers import BrowsableAPIRenderer
 
 
 @extend_schema_view(
     list=extend_schema(
         summary="List vendor services",
-        description="Vendor gets own services, Admin gets all services"
+        description="Vendor gets own services, Admin gets all services",
+        responses=ServiceRetriveListSerializer
     ),
     retrieve=extend_schema(
         summary="Get vendor service",
@@ -40,19 +58,24 @@ from rest_framework.exceptions import PermissionDenied
         summary="Delete vendor service"
     ),
 )
-class ServiceViewSet(ModelViewSet):
+class ServiceViewSet(OwnedQuerysetMixin, ModelViewSet):
     permission_classes = [IsAuthenticated, IsVendorOrAdmin]
+    owner_lookup = "vendor__user_id"
+    vendor_lookup = "vendor_id"
 
     def get_queryset(self):
-        user = self.request.user
-
-        if user.role == "admin":
-            return Service.objects.all()
+        queryset = self.scope_to_owner(Service.objects.all())
 
-        return Service.objects.filter(vendor__user=user)
+        if self.action == "list":
+            return queryset.values(*ServiceListProjection.columns)
+        if self.action == "retrieve":
+            return queryset.with_vendor_and_variants().with_owner()
+        return queryset.with_owner()
 
     def get_serializer_class(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action == "list":
+            return ServiceListProjection
+        if self.action == "retrieve":
             return ServiceRetriveListSerializer
         return ServiceCreateUpdateSerializer
     
@@ -99,48 +122,167 @@ class ServiceViewSet(ModelViewSet):
         summary="Delete vendor service variant"
     ),
 )
-class ServiceVariantViewSet(ModelViewSet):
+class ServiceVariantViewSet(OwnedQuerysetMixin, ModelViewSet):
     permission_classes = [IsAuthenticated, IsVendorOrAdmin]
+    owner_lookup = "service__vendor__user_id"
+    vendor_lookup = "service__vendor_id"
 
     def get_queryset(self):
-        user = self.request.user
-
-        if user.role == "admin":
-            return ServiceVariant.objects.all()
-
-        return ServiceVariant.objects.filter(service__vendor__user=user)
+        return self.scope_to_owner(ServiceVariant.objects.with_service().with_owner())
     
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]:
             return ServiceVariantResponseSerializer
         return ServiceVariantCreateUpdateSerializer
     
+    def check_service_owner(self, serializer):
+        service = serializer.validated_data.get("service")
+        if service is not None and owner_id_of(service) != self.request.user.id:
+            raise PermissionDenied("You cannot add variants to another vendor's service")
+
     def perform_create(self, serializer):
         user = self.request.user
-        service = serializer.validated_data["service"]
         
         if user.role != "vendor":
             raise PermissionDenied("Only vendors can create service variants")
         
-        if service.vendor.user != user:
-            raise PermissionDenied("You cannot add variants to another vendor's service")
+        if serializer.validated_data.get("service") is None:
+            raise PermissionDenied("A service is required to add a variant")
+        self.check_service_owner(serializer)
+
+        serializer.save()
 
+    def perform_update(self, serializer):
+        # vendors may not move a variant onto another vendor's service
+        if self.request.user.role != "admin":
+            self.check_service_owner(serializer)
         serializer.save()
+
+    @extend_schema(
+        summary="Bulk create/update vendor service variants",
+        description=(
+            "Body is a list of variants. Items without id are created, items with id are updated. "
+            "Valid items are written in one transaction and invalid ones are reported by index."
+        ),
+        request=ServiceVariantBulkItemSerializer(many=True),
+    )
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(success=False, message="A non-empty list of variants is required", status_code=status.HTTP_400_BAD_REQUEST)
+        if len(items) > BULK_MAX_ITEMS:
+            return Response(success=False, message=f"At most {BULK_MAX_ITEMS} variants per request", status_code=status.HTTP_400_BAD_REQUEST)
+
+        results, errors = bulk_upsert_variants(request.user, items)
+        return Response(
+            success=not errors,
+            message="Variants saved" if not errors else "Some variants could not be saved",
+            data={"results": results, "errors": errors},
+            status_code=status.HTTP_200_OK if results else status.HTTP_400_BAD_REQUEST,
+        )
         
 class ServiceCustomerListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
-    serializer_class = ServiceRetriveListSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    serializer_class = ServiceListProjection
+    pagination_class = CatalogPagination
 
     def get_queryset(self):
-        user = self.request.user
-        if user.role == "customer":
-            return Service.objects.approved()
-        raise PermissionDenied("Only customers can view approved services")
+        queryset = filter_catalog(Service.objects.in_catalog(), self.request.query_params)
+        # the cursor reads the sort column from the row
+        return queryset.values(*ServiceListProjection.columns, "min_price", "min_duration")
+
+    @extend_schema(
+        description=(
+            "Filters: min_price, max_price, max_minutes, in_stock=1. "
+            "ordering: newest (default), price, -price, duration, -duration."
+        ),
+        responses=ServiceRetriveListSerializer,
+    )
+    def list(self, request, *args, **kwargs):
+        if request.user.role != "customer":
+            raise PermissionDenied("Only customers can view approved services")
+
+        # the versioned cache key doubles as the validator: it changes on
+        # every catalog write, and the client gets a 304 before any query
+        key = list_cache_key(request)
+        build = super().list
+        return conditional_response(
+            request,
+            lambda: DRFResponse(get_or_build(key, lambda: build(request, *args, **kwargs).data)),
+            etag=make_etag(key),
+        )
+    
+class ServiceCustomerFacetsAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Catalog facet counts",
+        description=(
+            "Counts of in-stock services and of services per price and duration bucket, "
+            "for the same filters as the catalog list."
+        ),
+        responses={200: None},
+    )
+    def get(self, request):
+        if request.user.role != "customer":
+            raise PermissionDenied("Only customers can view approved services")
+
+        try:
+            queryset = filter_catalog(Service.objects.in_catalog(), request.query_params)
+        except ValidationError as e:
+            return Response(
+                success=False,
+                message=e.detail["message"],
+                status_code=e.detail["status_code"],
+            )
+        key = list_cache_key(request)
+        return conditional_response(
+            request,
+            lambda: Response(data=get_or_build(key, lambda: catalog_facets(queryset))),
+            etag=make_etag(key),
+        )
+
+
+class ServiceCustomerSearchView(generics.ListAPIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    serializer_class = ServiceListProjection
+    pagination_class = OffsetPagination
+
+    def get_queryset(self):
+        text = self.request.query_params.get("q", "").strip()
+        if not text:
+            raise ValidationError("Search text (q) is required")
+        queryset = filter_catalog(Service.objects.in_catalog(), self.request.query_params)
+        return search_services(queryset.values(*ServiceListProjection.columns), text)
+
+    @extend_schema(
+        summary="Search approved services",
+        description="Ranked search over service, vendor business and variant names.",
+        parameters=[OpenApiParameter("q", str, required=True)],
+        responses=ServiceRetriveListSerializer,
+    )
+    def list(self, request, *args, **kwargs):
+        if request.user.role != "customer":
+            raise PermissionDenied("Only customers can search approved services")
+        return super().list(request, *args, **kwargs)
     
 class ServiceCustomerRetrieveView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     serializer_class = ServiceRetriveListSerializer
-    queryset = Service.objects.all()
+    queryset = Service.objects.catalog()
+
+    def retrieve(self, request, *args, **kwargs):
+        key = detail_cache_key(kwargs["pk"])
+        build = super().retrieve
+        return conditional_response(
+            request,
+            lambda: DRFResponse(get_or_build(key, lambda: build(request, *args, **kwargs).data)),
+            etag=make_etag(key),
+        )
     
 class ServiceAdminApproveAPIView(APIView):
     permission_classes = [IsAuthenticated]
@@ -156,8 +298,54 @@ class ServiceAdminApproveAPIView(APIView):
         if user.role != "admin":
             raise PermissionDenied("Only admin can approve/unapprove services")
 
-        service = generics.get_object_or_404(Service, pk=pk)
+        service = generics.get_object_or_404(Service.objects.with_vendor_and_variants(), pk=pk)
         serializer = ServiceApproveSerializer(service, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(data=ServiceRetriveListSerializer(service).data, status_code=status.HTTP_200_OK)
+
+
+class CatalogImportAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    @extend_schema(
+        request=CatalogImportUploadSerializer,
+        responses={202: CatalogImportSerializer},
+        summary="Import services and variants from a file",
+        description=(
+            "Vendor uploads a CSV or JSONL file with service, variant, price, estimated_minutes and stock. "
+            "Rows are upserted by service name + variant name in the background."
+        ),
+    )
+    def post(self, request):
+        if request.user.role != "vendor":
+            raise PermissionDenied("Only vendors can import services")
+        vendor = Vendor.objects.filter(user=request.user).first()
+        if not vendor:
+            raise PermissionDenied("Vendor profile does not exist.")
+
+        serializer = CatalogImportUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        catalog_import = CatalogImport.objects.create(vendor=vendor, **serializer.validated_data)
+        transaction.on_commit(lambda: import_catalog.delay(catalog_import.id))
+        return Response(
+            message="Import accepted",
+            data=CatalogImportSerializer(catalog_import).data,
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
+
+class CatalogImportDetailAPIView(generics.RetrieveAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = CatalogImportSerializer
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role == "admin":
+            return CatalogImport.objects.all()
+        return CatalogImport.objects.filter(vendor__user=user)
+
+    @extend_schema(summary="Catalog import progress")
+    def get(self, request, *args, **kwargs):
+        return Response(data=self.get_serializer(self.get_object()).data)
@@ -1,3 +1,23 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from vendors.models import Vendor
 
-# Create your tests here.
+
+class VendorRetrieveTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email="vendor@example.com", password=None, role="vendor")
+        self.vendor = Vendor.objects.create(user=user, business_name="Fixers", address="Dhaka")
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_retrieve_own_profile(self):
+        response = self.client.get(f"/vendors/{self.vendor.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response)
+
+    def test_unknown_pk_is_not_found(self):
+        self.assertEqual(self.client.get(f"/vendors/{self.vendor.id + 1}/").status_code, 404)
+
+    def test_non_numeric_pk_is_not_found(self):
+        self.assertEqual(self.client.get("/vendors/abc/").status_code, 404)
@@ -1,14 +1,16 @@
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework import status
+from rest_framework import generics, status
 from common.validation_err import ValidationError
 from vendors.models import Vendor
 from .serializers import VendorCreateUpdateSerializer, VendorRetrieveSerializer
 from drf_spectacular.utils import extend_schema_view, extend_schema, inline_serializer
 from rest_framework import serializers as drf_serializers
-from common import Response, IsVendorOrAdmin
+from common import Response, IsVendorOrAdmin, OwnedQuerysetMixin
 from django.db import transaction
+from django.db.models import Count, Max
+from common.conditional import conditional_response, make_etag
 from rest_framework.exceptions import PermissionDenied
 
 
@@ -41,16 +43,35 @@ from rest_framework.exceptions import PermissionDenied
         summary="Delete vendor profile"
     ),
 )
-class VendorBusinessProfileViewSet(ModelViewSet):
+class VendorBusinessProfileViewSet(OwnedQuerysetMixin, ModelViewSet):
     permission_classes = [IsAuthenticated, IsVendorOrAdmin]
+    owner_lookup = "user_id"
+    vendor_lookup = "id"
 
     def get_queryset(self):
-        user = self.request.user
+        return self.scope_to_owner(Vendor.objects.select_related("user"))
 
-        if user.role == "admin":
-            return Vendor.objects.all()
+    def list(self, request, *args, **kwargs):
+        # one aggregate over the visible profiles; Count catches deletes
+        stats = self.get_queryset().aggregate(last_modified=Max("updated_at"), total=Count("id"))
+        return conditional_response(
+            request,
+            lambda: super(VendorBusinessProfileViewSet, self).list(request, *args, **kwargs),
+            etag=make_etag("vendors", stats["total"], stats["last_modified"]),
+            last_modified=stats["last_modified"],
+        )
 
-        return Vendor.objects.filter(user=user)
+    def retrieve(self, request, *args, **kwargs):
+        # DRF's lookup: a missing or malformed pk (e.g. /vendors/abc/) is a 404
+        updated_at = generics.get_object_or_404(
+            self.get_queryset().values_list("updated_at", flat=True), pk=kwargs["pk"]
+        )
+        return conditional_response(
+            request,
+            lambda: super(VendorBusinessProfileViewSet, self).retrieve(request, *args, **kwargs),
+            etag=make_etag("vendor", kwargs["pk"], updated_at),
+            last_modified=updated_at,
+        )
 
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]: